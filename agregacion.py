@@ -0,0 +1,65 @@
+"""Agregación temporal y reducción de puntos de las series de RDO antes de graficar."""
+import numpy as np
+import pandas as pd
+
+# Etiqueta visible -> regla de pandas (las semanas empiezan en lunes, los meses el día 1)
+FRECUENCIAS = {'Día': 'D', 'Semana': 'W-MON', 'Mes': 'MS'}
+
+COLS_SUMA = ['Físico Diario (%)', 'Inversión Diaria ($)']
+COLS_ULTIMO = ['Físico Acum (%)', 'Financiero Acum ($)', 'Saldo ($)']
+
+# Máximo de puntos por traza enviados al navegador y tamaño a partir del cual se usa WebGL
+MAX_PUNTOS = 1000
+UMBRAL_WEBGL = 500
+
+
+def serie_temporal(df_final):
+    """Columnas numéricas del historial sobre un DatetimeIndex ordenado ('Fecha')."""
+    serie = df_final[COLS_SUMA + COLS_ULTIMO].astype(float)
+    serie.index = pd.DatetimeIndex(pd.to_datetime(df_final['Fecha']), name='Fecha')
+    return serie.sort_index(kind='stable')
+
+
+def agregar(df_final, frecuencia='Mes'):
+    """Remuestrea por día, semana o mes: suma los valores diarios y toma el último acumulado.
+
+    Los periodos sin RDO conservan el acumulado y el saldo del periodo anterior.
+    """
+    serie = serie_temporal(df_final)
+    # Periodos cerrados y etiquetados a la izquierda: la semana del lunes 6 va del 6 al 12
+    muestras = serie.resample(FRECUENCIAS[frecuencia], closed='left', label='left')
+    agregado = pd.concat([muestras[COLS_SUMA].sum(), muestras[COLS_ULTIMO].last().ffill()], axis=1)
+    return agregado.reset_index()
+
+
+def lttb(x, y, n_salida):
+    """Índices elegidos por Largest-Triangle-Three-Buckets: reduce la serie conservando su forma."""
+    n = len(y)
+    if n_salida >= n or n_salida < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    bordes = np.linspace(1, n - 1, n_salida - 1).astype(np.int64)
+    indices = np.empty(n_salida, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_salida - 2):
+        ini, fin = bordes[i], bordes[i + 1]
+        sig_fin = bordes[i + 2] if i + 2 < len(bordes) else n
+        cx, cy = x[fin:sig_fin].mean(), y[fin:sig_fin].mean()
+        areas = np.abs((x[a] - cx) * (y[ini:fin] - y[a]) - (x[a] - x[ini:fin]) * (cy - y[a]))
+        a = ini + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+def reducir(df, x, y, n_salida=MAX_PUNTOS):
+    """Filas de `df` que sobreviven a LTTB sobre (x, y); sin cambios si ya es pequeño."""
+    if len(df) <= n_salida:
+        return df
+    eje_x = pd.to_datetime(df[x]).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    return df.iloc[lttb(eje_x, df[y].to_numpy(), n_salida)]
+
+
+def usa_webgl(n_puntos):
+    return n_puntos > UMBRAL_WEBGL
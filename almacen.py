@@ -0,0 +1,563 @@
+"""Almacenamiento persistente de los RDO (SQLite embebido, una fila por día y contrato)."""
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from datetime import date
+
+import pandas as pd
+
+# --- UBICACIÓN DE LOS DATOS ---
+RUTA_DATOS = os.environ.get("RDO_DATOS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos"))
+RUTA_DB = os.path.join(RUTA_DATOS, "rdo.sqlite")
+
+# Columna SQL -> columna del DataFrame que usa la app
+COLUMNAS = {
+    'fecha': 'Fecha',
+    'dia_n': 'Día N',
+    'fisico_diario': 'Físico Diario (%)',
+    'inversion_diaria': 'Inversión Diaria ($)',
+    'fisico_acum': 'Físico Acum (%)',
+    'financiero_acum': 'Financiero Acum ($)',
+    'saldo': 'Saldo ($)',
+    'detalle': 'Detalle',
+    'fotos': 'Fotos',
+    'hito1': 'Hito 1 (%)',
+    'hito2': 'Hito 2 (%)',
+    'porcentaje_total': 'Porcentaje Total (%)',
+    'cpi': 'CPI Declarado',
+    'spi': 'SPI Declarado',
+}
+COLUMNAS_SQL = {v: k for k, v in COLUMNAS.items()}
+
+# Tipos de los DataFrame de RDO en memoria. Los porcentajes caben en float32; los
+# montos quedan en float64 porque float32 (7 cifras) no llega a los centavos de un
+# contrato de cientos de miles de dólares.
+TIPOS = {
+    'contrato': 'category',
+    'Fecha': 'datetime64[ns]',
+    'Día N': 'category',
+    'Físico Diario (%)': 'float32',
+    'Inversión Diaria ($)': 'float64',
+    'Físico Acum (%)': 'float32',
+    'Financiero Acum ($)': 'float64',
+    'Saldo ($)': 'float64',
+    'Fotos': 'int16',
+    'Hito 1 (%)': 'float32',
+    'Hito 2 (%)': 'float32',
+    'Porcentaje Total (%)': 'float32',
+    'CPI Declarado': 'float32',
+    'SPI Declarado': 'float32',
+}
+# Al guardar un float32 se redondea para no persistir su ruido binario (0.37 -> 0.3700000047)
+DECIMALES_FLOAT32 = 4
+
+# Formato de tabla de las columnas numéricas. El texto se guarda al escribir, en
+# "<columna>_txt", para que la tabla del dashboard pagine filas ya formateadas.
+FORMATOS = {
+    'fisico_diario': "{:.2f}%", 'inversion_diaria': "$ {:,.2f}",
+    'fisico_acum': "{:.2f}%", 'financiero_acum': "$ {:,.2f}", 'saldo': "$ {:,.2f}",
+}
+COLUMNAS_TABLA = ['fecha', 'dia_n', *FORMATOS]
+
+# 'Día N' es texto libre ("Día 10" < "Día 2"): se ordena por orden de registro
+ORDEN_TABLA = {'Día N': 'id'}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS rdo (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    contrato TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    dia_n TEXT NOT NULL,
+    fisico_diario REAL NOT NULL DEFAULT 0,
+    inversion_diaria REAL NOT NULL DEFAULT 0,
+    fisico_acum REAL NOT NULL DEFAULT 0,
+    financiero_acum REAL NOT NULL DEFAULT 0,
+    saldo REAL NOT NULL DEFAULT 0,
+    detalle TEXT NOT NULL DEFAULT '',
+    fotos INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_rdo_contrato ON rdo (contrato, id);
+CREATE INDEX IF NOT EXISTS ix_rdo_fecha ON rdo (contrato, fecha);
+CREATE TABLE IF NOT EXISTS fotos (
+    rdo_id INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    extension TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (rdo_id, hash)
+);
+CREATE TABLE IF NOT EXISTS versiones (
+    contrato TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+# Columnas agregadas después de la primera versión del esquema: se crean al abrir la base
+COLUMNAS_NUEVAS = {
+    **{f"{col}_txt": "TEXT" for col in FORMATOS},
+    'hito1': "REAL NOT NULL DEFAULT 0",
+    'hito2': "REAL NOT NULL DEFAULT 0",
+    'porcentaje_total': "REAL NOT NULL DEFAULT 0",
+    'cpi': "REAL",
+    'spi': "REAL",
+}
+
+
+def _a_sql(fila):
+    """Convierte una fila con nombres de la app a un dict de columnas SQL (con sus textos)."""
+    datos = {COLUMNAS_SQL[col]: val for col, val in fila.items() if col in COLUMNAS_SQL}
+    if isinstance(datos.get('fecha'), date):
+        datos['fecha'] = datos['fecha'].isoformat()
+    for col in FORMATOS.keys() & datos.keys():
+        datos[f"{col}_txt"] = FORMATOS[col].format(datos[col])
+    return datos
+
+
+def tipar(df):
+    """Aplica TIPOS a las columnas presentes de un DataFrame de RDO."""
+    return df.astype({col: tipo for col, tipo in TIPOS.items() if col in df.columns})
+
+
+def _a_sql_lote(df):
+    """Columnas SQL y filas de parámetros de un DataFrame con nombres de la app (con sus textos)."""
+    columnas = [col for col in df.columns if col in COLUMNAS_SQL]
+    valores = df[columnas].rename(columns=COLUMNAS_SQL).astype(object)
+    if 'fecha' in valores:
+        valores['fecha'] = pd.to_datetime(df['Fecha']).dt.strftime('%Y-%m-%d').to_numpy()
+    for col in columnas:
+        if df[col].dtype == 'float32':
+            valores[COLUMNAS_SQL[col]] = df[col].astype('float64').round(DECIMALES_FLOAT32).to_numpy()
+    for col in [col for col in valores.columns if col in FORMATOS]:
+        valores[f"{col}_txt"] = [FORMATOS[col].format(v) for v in valores[col]]
+    filas = [
+        [v.item() if hasattr(v, 'item') else v for v in fila]
+        for fila in valores.itertuples(index=False, name=None)
+    ]
+    return list(valores.columns), filas
+
+
+def _sql_insertar(columnas):
+    """INSERT en rdo de 'contrato' + `columnas` SQL, con sus marcadores."""
+    return f"INSERT INTO rdo (contrato, {', '.join(columnas)}) VALUES ({', '.join(['?'] * (len(columnas) + 1))})"
+
+
+def _fila(registro):
+    """Tupla SQL (en el orden de COLUMNAS) -> dict con nombres de la app."""
+    fila = dict(zip(COLUMNAS.values(), registro))
+    fila['Fecha'] = date.fromisoformat(fila['Fecha'])
+    return fila
+
+
+class IndiceRDO:
+    """Índice en memoria de un contrato: fecha -> ids e id -> (fecha, Día N).
+
+    Se mantiene al escribir, para que la validación de fechas duplicadas (al
+    registrar y al corregir) y la selección del registro a corregir no recorran
+    el historial.
+    """
+
+    def __init__(self):
+        self.por_fecha = {}
+        self.etiquetas = {}
+
+    def agregar(self, id_rdo, fecha, dia_n):
+        self.por_fecha.setdefault(fecha, set()).add(id_rdo)
+        self.etiquetas[id_rdo] = (fecha, dia_n)
+
+    def _desindexar(self, id_rdo):
+        fecha, _ = self.etiquetas[id_rdo]
+        ids = self.por_fecha[fecha]
+        ids.discard(id_rdo)
+        if not ids:
+            del self.por_fecha[fecha]
+
+    def mover(self, id_rdo, fecha, dia_n):
+        """Reindexa un RDO corregido; conserva su posición en el orden de registro."""
+        if self.etiquetas.get(id_rdo) == (fecha, dia_n):
+            return
+        if id_rdo in self.etiquetas:
+            self._desindexar(id_rdo)
+        self.agregar(id_rdo, fecha, dia_n)
+
+
+class ConflictoVersion(Exception):
+    """El contrato cambió (otra sesión guardó) desde que se leyeron sus datos."""
+
+    def __init__(self, contrato, esperada, actual):
+        super().__init__(f"{contrato}: versión {esperada} desactualizada (actual {actual})")
+        self.contrato = contrato
+        self.esperada = esperada
+        self.actual = actual
+
+
+class FechaRepetida(ValueError):
+    """Ya hay un RDO del contrato con esa fecha."""
+
+    def __init__(self, fecha):
+        super().__init__(f"⛔ LA FECHA {fecha.strftime('%d/%m/%Y')} YA EXISTE.")
+        self.fecha = fecha
+
+
+class AlmacenRDO:
+    """Registros diarios de obra de todos los contratos, persistidos en disco.
+
+    Una sola instancia se comparte entre todas las sesiones del servidor. Las
+    lecturas se hacen bajo demanda, solo del contrato que se está mostrando. Las
+    escrituras pasan por una cola atendida por un único hilo escritor, que las
+    agrupa en una transacción por lote; cada una puede exigir una versión del
+    contrato (`version_esperada`) y se rechaza con ConflictoVersion si otra
+    sesión escribió antes, sin afectar al resto del lote.
+    """
+
+    MAX_LOTE = 64
+
+    def __init__(self, ruta=RUTA_DB):
+        if ruta != ":memory:":
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        self._lock = threading.Lock()
+        self._indices = {}
+        self._versiones = {}
+        self._version_global = 0
+        # Transacciones explícitas: las abre y cierra el hilo escritor
+        self._con = sqlite3.connect(ruta, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute("PRAGMA synchronous=NORMAL")
+            self._con.executescript(ESQUEMA)
+            self._migrar()
+        self._cola = queue.Queue()
+        self._escritor = threading.Thread(target=self._atender_cola, name="almacen-escritor", daemon=True)
+        self._escritor.start()
+
+    def _migrar(self):
+        """Agrega las COLUMNAS_NUEVAS que falten y formatea las filas que no tienen texto."""
+        existentes = {col for _, col, *_ in self._con.execute("PRAGMA table_info(rdo)")}
+        for col, tipo in COLUMNAS_NUEVAS.items():
+            if col not in existentes:
+                self._con.execute(f"ALTER TABLE rdo ADD COLUMN {col} {tipo}")
+        pendientes = self._con.execute(
+            f"SELECT id, {', '.join(FORMATOS)} FROM rdo WHERE saldo_txt IS NULL"
+        ).fetchall()
+        if pendientes:
+            asignaciones = ", ".join(f"{col}_txt = ?" for col in FORMATOS)
+            self._con.execute("BEGIN IMMEDIATE")
+            self._con.executemany(
+                f"UPDATE rdo SET {asignaciones} WHERE id = ?",
+                [[formato.format(v) for formato, v in zip(FORMATOS.values(), valores)] + [id_rdo]
+                 for id_rdo, *valores in pendientes],
+            )
+            self._con.execute("COMMIT")
+
+    def cerrar(self):
+        """Termina el hilo escritor (tras vaciar la cola) y cierra la conexión."""
+        self._cola.put(None)
+        self._escritor.join()
+        self._con.close()
+
+    # --- VERSIONES ---
+    def _leer_version(self, contrato):
+        if contrato not in self._versiones:
+            registro = self._con.execute("SELECT version FROM versiones WHERE contrato = ?", (contrato,)).fetchone()
+            self._versiones[contrato] = registro[0] if registro else 0
+        return self._versiones[contrato]
+
+    def version(self, contrato):
+        """Contador que aumenta con cada escritura del contrato (clave de cachés y de concurrencia)."""
+        with self._lock:
+            return self._leer_version(contrato)
+
+    def _incrementar_version(self, contrato):
+        """Se llama dentro de la transacción de cada escritura (con el lock tomado)."""
+        self._con.execute(
+            "INSERT INTO versiones (contrato, version) VALUES (?, 1) "
+            "ON CONFLICT (contrato) DO UPDATE SET version = version + 1",
+            (contrato,),
+        )
+        self._versiones.pop(contrato, None)
+        self._version_global += 1
+
+    def version_global(self):
+        """Cambia con cualquier escritura de cualquier contrato (clave de la caché del portafolio)."""
+        return self._version_global
+
+    # --- COLA DE ESCRITURA ---
+    def _escribir(self, contrato, operacion, version_esperada=None):
+        """Encola `operacion` para el hilo escritor y espera su resultado (o su excepción)."""
+        futuro = Future()
+        self._cola.put((contrato, operacion, version_esperada, futuro))
+        return futuro.result()
+
+    def _atender_cola(self):
+        while True:
+            pedido = self._cola.get()
+            if pedido is None:
+                return
+            lote = [pedido]
+            while len(lote) < self.MAX_LOTE:
+                try:
+                    pedido = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if pedido is None:
+                    self._cola.put(None)
+                    break
+                lote.append(pedido)
+            self._aplicar_lote(lote)
+
+    def _aplicar_lote(self, lote):
+        """Un COMMIT por lote; cada operación va en su SAVEPOINT para poder rechazarla sola."""
+        resultados = []
+        with self._lock:
+            try:
+                self._con.execute("BEGIN IMMEDIATE")
+                for contrato, operacion, version_esperada, futuro in lote:
+                    self._con.execute("SAVEPOINT escritura")
+                    try:
+                        if version_esperada is not None:
+                            actual = self._leer_version(contrato)
+                            if actual != version_esperada:
+                                raise ConflictoVersion(contrato, version_esperada, actual)
+                        resultados.append((futuro, operacion(), None))
+                        self._con.execute("RELEASE escritura")
+                    except Exception as e:
+                        self._con.execute("ROLLBACK TO escritura")
+                        self._con.execute("RELEASE escritura")
+                        resultados.append((futuro, None, e))
+                self._con.execute("COMMIT")
+            except Exception as e:
+                if self._con.in_transaction:
+                    self._con.execute("ROLLBACK")
+                # El estado en memoria pudo adelantarse a lo que quedó en disco
+                self._indices.clear()
+                self._versiones.clear()
+                self._version_global += 1
+                resultados = [(pedido[3], None, e) for pedido in lote]
+        for futuro, resultado, error in resultados:
+            if error is None:
+                futuro.set_result(resultado)
+            else:
+                futuro.set_exception(error)
+
+    # --- ESCRITURA ---
+    def _insertar(self, contrato, fila):
+        """INSERT de una fila (dentro de una operación del hilo escritor); devuelve su id."""
+        datos = _a_sql(fila)
+        cur = self._con.execute(_sql_insertar(list(datos)), [contrato, *datos.values()])
+        self._incrementar_version(contrato)
+        if contrato in self._indices:
+            self._indices[contrato].agregar(cur.lastrowid, date.fromisoformat(datos['fecha']), datos['dia_n'])
+        return cur.lastrowid
+
+    def _insertar_lote(self, contrato, columnas, filas):
+        """INSERT de muchas filas de `_a_sql_lote` (dentro del hilo escritor); devuelve cuántas."""
+        self._con.executemany(_sql_insertar(columnas), [[contrato, *fila] for fila in filas])
+        self._incrementar_version(contrato)
+        # El índice se reconstruye con una consulta en el próximo uso
+        self._indices.pop(contrato, None)
+        return len(filas)
+
+    def agregar_sobre_ultimo(self, contrato, construir_fila):
+        """Inserta `construir_fila(último RDO o None)` al final del historial; devuelve su id.
+
+        El último RDO se lee dentro de la transacción del hilo escritor, así los
+        acumulados de altas simultáneas en el mismo contrato se encadenan sin
+        exigir versión ni reintentar. Lanza FechaRepetida si la fecha ya existe.
+        """
+        def operacion():
+            fila = construir_fila(self._ultimo(contrato))
+            if fila['Fecha'] in self._indice(contrato).por_fecha:
+                raise FechaRepetida(fila['Fecha'])
+            return self._insertar(contrato, fila)
+        return self._escribir(contrato, operacion)
+
+    def agregar_lote(self, contrato, df, version_esperada=None):
+        """Inserta muchos RDO en una sola transacción, en el orden de `df`; devuelve la nueva versión."""
+        columnas, filas = _a_sql_lote(df)
+
+        def operacion():
+            self._insertar_lote(contrato, columnas, filas)
+            return self._leer_version(contrato)
+        return self._escribir(contrato, operacion, version_esperada)
+
+    def agregar_lote_sobre_ultimo(self, contrato, construir_lote):
+        """Como `agregar_lote`, con el DataFrame de `construir_lote(último RDO o None)`.
+
+        El último RDO se lee en la transacción del hilo escritor (ver
+        `agregar_sobre_ultimo`). Lanza FechaRepetida si alguna fecha ya existe.
+        """
+        def operacion():
+            df = construir_lote(self._ultimo(contrato))
+            existentes = self._indice(contrato).por_fecha
+            for fecha in df['Fecha']:
+                if fecha in existentes:
+                    raise FechaRepetida(fecha)
+            return self._insertar_lote(contrato, *_a_sql_lote(df))
+        return self._escribir(contrato, operacion)
+
+    def actualizar_lote(self, contrato, df, version_esperada=None):
+        """Reescribe en una sola transacción varias filas existentes (índice = id del RDO)."""
+        columnas = [col for col in df.columns if col in COLUMNAS_SQL]
+        columnas_sql, filas = _a_sql_lote(df)
+        asignaciones = ", ".join(f"{col} = ?" for col in columnas_sql)
+        parametros = [[*fila, contrato, int(id_rdo)] for id_rdo, fila in zip(df.index, filas)]
+
+        def operacion():
+            self._con.executemany(f"UPDATE rdo SET {asignaciones} WHERE contrato = ? AND id = ?", parametros)
+            self._incrementar_version(contrato)
+            indice = self._indices.get(contrato)
+            if indice is not None and ('Fecha' in columnas or 'Día N' in columnas):
+                ids = [int(i) for i in df.index]
+                fechas = pd.to_datetime(df['Fecha']).dt.date if 'Fecha' in columnas else [indice.etiquetas[i][0] for i in ids]
+                dias = df['Día N'] if 'Día N' in columnas else [indice.etiquetas[i][1] for i in ids]
+                for id_rdo, fecha, dia_n in zip(ids, fechas, dias):
+                    indice.mover(id_rdo, fecha, dia_n)
+        return self._escribir(contrato, operacion, version_esperada)
+
+    def vincular_fotos(self, contrato, id_rdo, fotos):
+        """Asocia fotos [(hash, extensión)] a un RDO y actualiza su conteo; devuelve el total."""
+        def operacion():
+            self._con.executemany(
+                "INSERT OR IGNORE INTO fotos (rdo_id, hash, extension) VALUES (?, ?, ?)",
+                [(int(id_rdo), hash_foto, extension) for hash_foto, extension in fotos],
+            )
+            total = self._con.execute("SELECT COUNT(*) FROM fotos WHERE rdo_id = ?", (int(id_rdo),)).fetchone()[0]
+            self._con.execute("UPDATE rdo SET fotos = ? WHERE contrato = ? AND id = ?", (total, contrato, int(id_rdo)))
+            self._incrementar_version(contrato)
+            return total
+        return self._escribir(contrato, operacion)
+
+    def borrar(self, contrato):
+        """Elimina el historial de un contrato (para todas las sesiones)."""
+        def operacion():
+            self._con.execute("DELETE FROM fotos WHERE rdo_id IN (SELECT id FROM rdo WHERE contrato = ?)", (contrato,))
+            self._con.execute("DELETE FROM rdo WHERE contrato = ?", (contrato,))
+            self._incrementar_version(contrato)
+            self._indices.pop(contrato, None)
+        return self._escribir(contrato, operacion)
+
+    # --- LECTURA ---
+    def leer(self, contrato, detalle=False):
+        """Historial completo de un contrato en orden de registro (índice = id del RDO), con TIPOS.
+
+        'Detalle' (texto libre, lo más pesado de cada fila) solo se carga si se pide;
+        para un RDO suelto está en `obtener`.
+        """
+        columnas = [col for col in COLUMNAS if detalle or col != 'detalle']
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT id, {', '.join(columnas)} FROM rdo WHERE contrato = ? ORDER BY id",
+                self._con, params=(contrato,), index_col='id',
+            )
+        return tipar(df.rename(columns=COLUMNAS))
+
+    def leer_todos(self, columnas=('Fecha', 'Físico Acum (%)', 'Financiero Acum ($)')):
+        """Filas de todos los contratos (columna 'contrato' + `columnas`) en orden de registro, con TIPOS."""
+        sql = ", ".join(COLUMNAS_SQL[col] for col in columnas)
+        with self._lock:
+            df = pd.read_sql_query(f"SELECT contrato, {sql} FROM rdo ORDER BY id", self._con)
+        return tipar(df.rename(columns=COLUMNAS))
+
+    # --- TABLA PAGINADA ---
+    @staticmethod
+    def _filtro_fechas(contrato, desde, hasta):
+        condiciones, parametros = ["contrato = ?"], [contrato]
+        if desde is not None:
+            condiciones.append("fecha >= ?")
+            parametros.append(desde.isoformat())
+        if hasta is not None:
+            condiciones.append("fecha <= ?")
+            parametros.append(hasta.isoformat())
+        return " AND ".join(condiciones), parametros
+
+    def contar(self, contrato, desde=None, hasta=None):
+        """Cantidad de RDO del contrato con fecha en [desde, hasta] (extremos opcionales)."""
+        donde, parametros = self._filtro_fechas(contrato, desde, hasta)
+        with self._lock:
+            return self._con.execute(f"SELECT COUNT(*) FROM rdo WHERE {donde}", parametros).fetchone()[0]
+
+    def pagina(self, contrato, inicio=0, cantidad=50, orden='Fecha', descendente=False, desde=None, hasta=None):
+        """Filas [inicio, inicio + cantidad) de la tabla del dashboard, ya formateadas como texto.
+
+        Se ordena por el valor de la columna `orden` (no por su texto; 'Día N' por
+        orden de registro) y se filtra por fecha en SQLite; solo viajan las filas
+        de la página.
+        """
+        donde, parametros = self._filtro_fechas(contrato, desde, hasta)
+        sentido = "DESC" if descendente else "ASC"
+        textos = [f"{col}_txt" if col in FORMATOS else col for col in COLUMNAS_TABLA]
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT {', '.join(textos)} FROM rdo WHERE {donde} "
+                f"ORDER BY {ORDEN_TABLA.get(orden, COLUMNAS_SQL[orden])} {sentido}, id {sentido} LIMIT ? OFFSET ?",
+                self._con, params=[*parametros, int(cantidad), int(inicio)],
+            )
+        df.columns = [COLUMNAS[col.removesuffix("_txt")] for col in df.columns]
+        return df
+
+    def fotos_de(self, contrato, id_rdo):
+        """[(hash, extensión)] de las fotos vinculadas a un RDO."""
+        with self._lock:
+            return self._con.execute(
+                "SELECT f.hash, f.extension FROM fotos f JOIN rdo r ON r.id = f.rdo_id "
+                "WHERE r.contrato = ? AND f.rdo_id = ? ORDER BY f.rowid",
+                (contrato, int(id_rdo)),
+            ).fetchall()
+
+    def _ultimo(self, contrato):
+        registro = self._con.execute(
+            f"SELECT {', '.join(COLUMNAS)} FROM rdo WHERE contrato = ? ORDER BY id DESC LIMIT 1",
+            (contrato,),
+        ).fetchone()
+        return None if registro is None else _fila(registro)
+
+    def ultimo(self, contrato):
+        """Último RDO del contrato (o None) sin cargar el historial."""
+        with self._lock:
+            return self._ultimo(contrato)
+
+    def obtener(self, contrato, id_rdo):
+        """Un RDO por su id (o None)."""
+        with self._lock:
+            registro = self._con.execute(
+                f"SELECT {', '.join(COLUMNAS)} FROM rdo WHERE contrato = ? AND id = ?",
+                (contrato, int(id_rdo)),
+            ).fetchone()
+        return None if registro is None else _fila(registro)
+
+    def anterior(self, contrato, id_rdo):
+        """RDO inmediatamente anterior a `id_rdo` en el historial (o None si es el primero)."""
+        with self._lock:
+            registro = self._con.execute(
+                f"SELECT {', '.join(COLUMNAS)} FROM rdo WHERE contrato = ? AND id < ? ORDER BY id DESC LIMIT 1",
+                (contrato, int(id_rdo)),
+            ).fetchone()
+        return None if registro is None else _fila(registro)
+
+    # --- ÍNDICE POR FECHA ---
+    def _indice(self, contrato):
+        """Índice del contrato; se construye con una sola consulta la primera vez."""
+        indice = self._indices.get(contrato)
+        if indice is None:
+            indice = IndiceRDO()
+            for id_rdo, fecha, dia_n in self._con.execute(
+                "SELECT id, fecha, dia_n FROM rdo WHERE contrato = ? ORDER BY id", (contrato,)
+            ):
+                indice.agregar(id_rdo, date.fromisoformat(fecha), dia_n)
+            self._indices[contrato] = indice
+        return indice
+
+    def existe_fecha(self, contrato, fecha, excepto=None):
+        """True si otro RDO del contrato (distinto del id `excepto`) ya tiene esa fecha."""
+        with self._lock:
+            return bool(self._indice(contrato).por_fecha.get(fecha, set()) - {excepto})
+
+    def fechas(self, contrato):
+        """Copia del conjunto de fechas ya registradas del contrato."""
+        with self._lock:
+            return set(self._indice(contrato).por_fecha)
+
+    def opciones_edicion(self, contrato):
+        """{id: "AAAA-MM-DD - Día N"} en orden de registro, para el selector de corrección."""
+        with self._lock:
+            etiquetas = self._indice(contrato).etiquetas
+            return {id_rdo: f"{fecha} - {dia_n}" for id_rdo, (fecha, dia_n) in etiquetas.items()}
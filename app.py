@@ -1,416 +1,565 @@
-import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, date
-
-# --- CONFIGURACIÓN DE LA PÁGINA ---
-st.set_page_config(layout="wide", page_title="SISTEMA DE GESTIÓN RDO & DASHBOARD", page_icon="⚡")
-
-# --- FUNCIÓN DE RESETEO ---
-def reset_app():
-    for key in ['data_zona1', 'data_zona2']:
-        if key in st.session_state:
-            del st.session_state[key]
-    st.session_state.pagina_actual = "MÓDULO 1: RDO (Lista de 19 Puntos)"
-    st.rerun()
-
-# --- GESTIÓN DE MEMORIA (INICIALIZACIÓN) ---
-if 'data_zona1' not in st.session_state:
-    st.session_state['data_zona1'] = pd.DataFrame({
-        'Fecha': [date(2025, 1, 1)],
-        'Día N': ['Inicio'],
-        'Físico Diario (%)': [0.0],
-        'Inversión Diaria ($)': [0.0],
-        'Físico Acum (%)': [0.0],
-        'Financiero Acum ($)': [0.0],
-        'Saldo ($)': [0.0], 
-        'Detalle': ['Inicio de Contrato'],
-        'Fotos': [0]
-    })
-
-if 'data_zona2' not in st.session_state:
-    st.session_state['data_zona2'] = pd.DataFrame({
-        'Fecha': [date(2025, 1, 1)],
-        'Día N': ['Inicio'],
-        'Físico Diario (%)': [0.0],
-        'Inversión Diaria ($)': [0.0],
-        'Físico Acum (%)': [0.0],
-        'Financiero Acum ($)': [0.0],
-        'Saldo ($)': [0.0],
-        'Detalle': ['Inicio de Contrato'],
-        'Fotos': [0]
-    })
-
-if 'pagina_actual' not in st.session_state:
-    st.session_state.pagina_actual = "MÓDULO 1: RDO (Lista de 19 Puntos)"
-
-def cambiar_pagina(nombre_pagina):
-    st.session_state.pagina_actual = nombre_pagina
-
-# --- ESTILOS VISUALES GENERALES ---
-st.markdown("""
-<style>
-    .main-header {font-size: 24px; font-weight: bold; color: #1E3A8A; margin-bottom: 10px;}
-    .stTextInput label, .stDateInput label, .stSelectbox label, .stTextArea label, .stNumberInput label, .stSlider label {
-        font-weight: bold !important; color: #b91c1c !important; font-size: 15px !important;
-    }
-    .ficha-tecnica {
-        width: 100%; border-collapse: collapse; margin-bottom: 20px; font-family: Arial, sans-serif; font-size: 12px; border: 1px solid #ddd;
-    }
-    .ficha-tecnica th {background-color: #1E3A8A; color: white; padding: 6px; text-align: left; border: 1px solid #ddd;}
-    .ficha-tecnica td {padding: 6px; border: 1px solid #ddd; background-color: #f9f9f9; color: #333;}
-    
-    div.stButton > button:first-child {
-        border-radius: 5px;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# --- BARRA LATERAL ---
-st.sidebar.image("https://upload.wikimedia.org/wikipedia/commons/e/e4/Logotipo_de_CNEL.svg", width=150)
-st.sidebar.title("Configuración")
-
-contrato_seleccionado = st.sidebar.selectbox(
-    "Seleccione el Contrato/Zona:",
-    ["ZONA 1 - SECTOR CAMARONERO", "ZONA 2 - SECTOR CAMARONERO"]
-)
-
-st.sidebar.markdown("---")
-
-modulo = st.sidebar.radio(
-    "Navegación:", 
-    ["MÓDULO 1: RDO (Lista de 19 Puntos)", "MÓDULO 2: DASHBOARD (Lista de 8 Puntos)"],
-    index=0 if st.session_state.pagina_actual == "MÓDULO 1: RDO (Lista de 19 Puntos)" else 1,
-    key="navegacion_radio",
-    on_change=lambda: cambiar_pagina(st.session_state.navegacion_radio)
-)
-
-st.sidebar.markdown("---")
-if st.sidebar.button("🗑️ RESETEAR RDO Y DASHBOARD", help="Borra todos los datos y reinicia a cero"):
-    reset_app()
-
-st.sidebar.info(f"**Oferente:** Consorcio FiscalRed\n**Usuario:** Fiscalizador")
-
-# --- FICHA TÉCNICA ---
-def obtener_ficha_tecnica(zona):
-    if zona == "ZONA 1 - SECTOR CAMARONERO":
-        return {
-            "Entidad": "CNEL EP - UNIDAD DE NEGOCIO EL ORO",
-            "Categoría": "CONSTRUCCION DE REDES DE DISTRIBUCION",
-            "Objeto": "EOR Construccion de redes electricas para proyectos PER sector camaronero zona 1 CAF GD",
-            "Código": "COTO-CNELEP-2025-43",
-            "Plazo": "150 Días Calendario",
-            "Contratista": "CONSORCIO CAF ARENILLAS",
-            "Rep_Legal": "OSCAR LUIS YANANGOMEZ SUQUILANDA (Procurador Común)",
-            "Monto_Str": "$ 399.743,03",
-            "Monto_Num": 399743.03,
-            "Link": "https://www.compraspublicas.gob.ec/ProcesoContratacion/compras/PC/informacionProcesoContratacion2.cpe?idSoliCompra=Mlped7h-x8tM2Mi5JzAbNVHBoqrlPkyFh2Yoxj85zQc"
-        }
-    else:
-        return {
-            "Entidad": "CNEL EP - UNIDAD DE NEGOCIO EL ORO",
-            "Categoría": "CONSTRUCCION DE REDES DE DISTRIBUCION",
-            "Objeto": "EOR Construccion de redes electricas para proyectos PER sector camaronero zona 2 CAF GD",
-            "Código": "COTO-CNELEP-2025-44",
-            "Plazo": "150 Días Calendario",
-            "Contratista": "CONSORCIO REDES HUNTER",
-            "Rep_Legal": "CRISTHIAN MANUEL ROMERO FREIRE (Procurador Común)",
-            "Monto_Str": "$ 499.654,23",
-            "Monto_Num": 499654.23,
-            "Link": "https://www.compraspublicas.gob.ec/ProcesoContratacion/compras/PC/informacionProcesoContratacion2.cpe?idSoliCompra=VJCoFonyH1vOnVROGwOunGmr6qD3pTr-znOrgilqON0,"
-        }
-
-ficha = obtener_ficha_tecnica(contrato_seleccionado)
-
-def dibujar_ficha(datos):
-    html_table = f"""
-    <table class="ficha-tecnica">
-        <tr><th colspan="4" style="text-align:center;">FICHA TÉCNICA DEL PROYECTO (CONTRATO DE OBRA)</th></tr>
-        <tr>
-            <td width="15%"><strong>Entidad:</strong></td><td width="35%">{datos['Entidad']}</td>
-            <td width="15%"><strong>Categoría:</strong></td><td width="35%">{datos['Categoría']}</td>
-        </tr>
-        <tr>
-            <td><strong>Objeto:</strong></td><td colspan="3">{datos['Objeto']}</td>
-        </tr>
-        <tr>
-            <td><strong>Código:</strong></td><td>{datos['Código']}</td>
-            <td><strong>Plazo:</strong></td><td>{datos['Plazo']}</td>
-        </tr>
-        <tr>
-            <td><strong>Contratista:</strong></td><td>{datos['Contratista']}</td>
-            <td><strong>Rep. Legal:</strong></td><td>{datos['Rep_Legal']}</td>
-        </tr>
-        <tr>
-            <td><strong>Monto USD:</strong></td><td>{datos['Monto_Str']}</td>
-            <td><strong>Link:</strong></td><td><a href="{datos['Link']}" target="_blank">Ver en SERCOP</a></td>
-        </tr>
-    </table>
-    """
-    st.markdown(html_table, unsafe_allow_html=True)
-
-# ==============================================================================
-# MÓDULO 1: RDO WEB (INGRESO DIARIO)
-# ==============================================================================
-if modulo == "MÓDULO 1: RDO (Lista de 19 Puntos)":
-    st.markdown(f'<div class="main-header">Módulo 1: Registro Diario de Obra (RDO)</div>', unsafe_allow_html=True)
-    dibujar_ficha(ficha)
-
-    key_data = 'data_zona1' if contrato_seleccionado == "ZONA 1 - SECTOR CAMARONERO" else 'data_zona2'
-    df_actual = st.session_state[key_data]
-    
-    if len(df_actual) > 0:
-        ultimo_reg = df_actual.iloc[-1]
-        prev_pct_acum = float(ultimo_reg['Físico Acum (%)'])
-        prev_monto_acum = float(ultimo_reg['Financiero Acum ($)'])
-    else:
-        prev_pct_acum = 0.0
-        prev_monto_acum = 0.0
-
-    modo_edicion = st.checkbox("🔓 Modificar Registro Anterior (Corrección)")
-    
-    defaults = {
-        "fecha": date.today(), "dia_n": "", "clima_idx": 0, "incidente_idx": 0,
-        "pct_diario": 0.0, "monto_diario": 0.0, "cpi": 0.0, "spi": 0.0,
-        "personal": "", "actividad": "", "firma": ""
-    }
-    indice_a_editar = -1
-
-    if modo_edicion:
-        st.info("⚠️ MODO EDICIÓN: Seleccione el día a corregir.")
-        df_validos = df_actual.iloc[1:]
-        opciones = df_validos['Fecha'].astype(str) + " - " + df_validos['Día N']
-        
-        if not opciones.empty:
-            seleccion = st.selectbox("Seleccione Registro:", opciones)
-            fecha_sel_str = seleccion.split(" - ")[0]
-            dia_sel = seleccion.split(" - ")[1]
-            mask = (df_actual['Fecha'].astype(str) == fecha_sel_str) & (df_actual['Día N'] == dia_sel)
-            if mask.any():
-                indice_a_editar = df_actual[mask].index[0]
-                fila = df_actual.loc[indice_a_editar]
-                defaults["fecha"] = fila['Fecha']
-                defaults["dia_n"] = fila['Día N']
-                defaults["pct_diario"] = float(fila['Físico Diario (%)'])
-                defaults["monto_diario"] = float(fila['Inversión Diaria ($)'])
-                defaults["actividad"] = fila['Detalle']
-                defaults["personal"] = "Personal registrado..." 
-                defaults["firma"] = "Fiscalizador"
-                idx_prev = indice_a_editar - 1
-                if idx_prev >= 0:
-                    prev_pct_acum = df_actual.iloc[idx_prev]['Físico Acum (%)']
-                    prev_monto_acum = df_actual.iloc[idx_prev]['Financiero Acum ($)']
-                else:
-                    prev_pct_acum = 0.0
-                    prev_monto_acum = 0.0
-        else:
-            st.warning("No hay registros para editar.")
-
-    with st.form("rdo_form", clear_on_submit=False):
-        st.markdown("### A. Datos Generales")
-        c1, c2 = st.columns(2)
-        in_fecha = c1.date_input("1. Fechas de Ejecución", defaults["fecha"])
-        in_dia = c2.text_input("4. Día de ejecución (Obligatorio)", defaults["dia_n"], placeholder="Ej: Día 1")
-        
-        c3, c4 = st.columns(2)
-        c3.text_input("2. Datos Económicos del Contrato", "$ 67,490.10 (Fiscalización)", disabled=True)
-        c4.text_input("3. Dato Económico total de los Proyectos", ficha['Monto_Str'], disabled=True)
-
-        st.markdown("### B. Condiciones de Campo")
-        col_clima, col_inc = st.columns(2)
-        in_clima = col_clima.selectbox("5. Condiciones climáticas (Obligatorio)", ["", "Soleado", "Nublado", "Lluvia", "Tormenta"], index=defaults["clima_idx"])
-        in_inc = col_inc.selectbox("19. Registro de Incidentes o accidentes", ["Sin Novedades", "Incidente Leve", "Accidente"], index=defaults["incidente_idx"])
-
-        st.markdown("### C. Control de Avance")
-        st.info(f"**6. Progreso General (Ingreso de Avance del DÍA):**")
-        m1, m2, m3 = st.columns(3)
-        in_pct_diario = m1.number_input("6.i. % de Avance DEL DÍA", min_value=0.0, max_value=100.0, value=defaults["pct_diario"], step=0.01)
-        in_monto_diario = m2.number_input("6.i. $ de Avance DEL DÍA", min_value=0.0, value=defaults["monto_diario"], step=100.0)
-        
-        nuevo_acum_monto = prev_monto_acum + in_monto_diario
-        nuevo_saldo = ficha['Monto_Num'] - nuevo_acum_monto
-        m3.metric("6.i. Avance Avaluado Acumulado (Automático)", f"$ {nuevo_acum_monto:,.2f}", f"Saldo: $ {nuevo_saldo:,.2f}")
-
-        st.markdown("**6.ii. Avance prorrateado por Hito**")
-        col_h1, col_h2 = st.columns(2)
-        col_h1.number_input("6.ii. Hito 1 (Civil) %", min_value=0.0, max_value=100.0, value=0.0)
-        col_h2.number_input("6.ii. Hito 2 (Eléctrico) %", min_value=0.0, max_value=100.0, value=0.0)
-        
-        st.markdown("**7. Indicadores de Desempeño y estimaciones**")
-        col_c, col_s = st.columns(2)
-        in_cpi = col_c.number_input("7. CPI (Costo)", value=defaults["cpi"], step=0.01)
-        in_spi = col_s.number_input("7. SPI (Cronograma)", value=defaults["spi"], step=0.01)
-        
-        cc1, cc2 = st.columns(2)
-        cc1.selectbox("14. Control mediante Tabla de cantidades y Reporte", ["", "SI - Verificado", "NO"], index=0)
-        cc2.text_input("15. Porcentaje total de los proyectos", "", placeholder="Ponderado...")
-
-        st.markdown("**8. Curva de Avance – Valor Ganado**")
-        fig_rdo = go.Figure()
-        fig_rdo.add_trace(go.Bar(x=["Anterior", "Nuevo"], y=[prev_pct_acum, prev_pct_acum + in_pct_diario], name='Crecimiento'))
-        fig_rdo.update_layout(height=150, margin=dict(t=10, b=10))
-        st.plotly_chart(fig_rdo, use_container_width=True)
-
-        st.markdown("### D. Administrativo y Detalle")
-        l1, l2, l3 = st.columns(3)
-        l1.text_input("16. Registro de Contratos Complementarios", "Ninguno")
-        l2.text_input("17. Registro de Ordenes de trabajo", "")
-        l3.text_input("18. Registro de Incremento de cantidades", "0.00%")
-
-        in_personal = st.text_area("13. Personal y Equipos (Obligatorio)", defaults["personal"], placeholder="Detalle cuadrilla...")
-        in_activ = st.text_area("10. Actividades ejecutadas en el día (Obligatorio)", defaults["actividad"], placeholder="Descripción...")
-        st.text_area("9. Observaciones de fiscalización", "")
-
-        st.markdown("**11. Registro fotográfico & 12. Firmas**")
-        c_foto, c_firma = st.columns(2)
-        in_fotos = c_foto.file_uploader("11. Registro fotográfico (Obligatorio)", accept_multiple_files=True)
-        in_firma = c_firma.text_input("12. Firmas de responsabilidad (Obligatorio)", defaults["firma"])
-
-        btn_label = "GUARDAR CAMBIOS" if modo_edicion else "GUARDAR RDO DIARIO"
-        submitted = st.form_submit_button(btn_label)
-    
-    if submitted:
-        errores = []
-        if not in_dia: errores.append("• Falta: 4. Día de ejecución")
-        if in_clima == "": errores.append("• Falta: 5. Condiciones climáticas")
-        if not in_personal: errores.append("• Falta: 13. Personal y Equipos")
-        if not in_activ: errores.append("• Falta: 10. Actividades Ejecutadas")
-        if not in_firma: errores.append("• Falta: 12. Firmas de responsabilidad")
-        if not modo_edicion and not in_fotos: errores.append("• Falta: 11. Registro fotográfico")
-        
-        if not modo_edicion:
-            fechas_existentes = df_actual['Fecha'].tolist()
-            if len(fechas_existentes) > 1 and in_fecha in fechas_existentes[1:]:
-                 errores.append(f"⛔ LA FECHA {in_fecha.strftime('%d/%m/%Y')} YA EXISTE.")
-
-        if errores:
-            st.error("⚠️ NO SE PUDO GUARDAR. REVISE:")
-            for e in errores: st.write(e)
-        else:
-            final_pct_acum = prev_pct_acum + in_pct_diario
-            final_monto_acum = prev_monto_acum + in_monto_diario
-            final_saldo = ficha['Monto_Num'] - final_monto_acum
-            if final_pct_acum > 100: final_pct_acum = 100.0
-            if final_monto_acum > ficha['Monto_Num']: final_monto_acum = ficha['Monto_Num']
-
-            nueva_fila = {
-                'Fecha': in_fecha, 'Día N': in_dia, 'Físico Diario (%)': in_pct_diario,
-                'Inversión Diaria ($)': in_monto_diario, 'Físico Acum (%)': final_pct_acum,
-                'Financiero Acum ($)': final_monto_acum, 'Saldo ($)': final_saldo,
-                'Detalle': in_activ, 'Fotos': len(in_fotos) if in_fotos else 0
-            }
-
-            if modo_edicion:
-                for col, val in nueva_fila.items():
-                    df_actual.at[indice_a_editar, col] = val
-                st.session_state[key_data] = df_actual
-                st.success(f"✅ REGISTRO '{in_dia}' CORREGIDO.")
-            else:
-                df_nuevo = pd.concat([df_actual, pd.DataFrame([nueva_fila])], ignore_index=True)
-                st.session_state[key_data] = df_nuevo
-                st.success(f"✅ REGISTRO DEL DÍA {in_fecha} GUARDADO.")
-
-            st.markdown("---")
-            c_msg, c_btn = st.columns([3, 1])
-            c_msg.info("Base de datos actualizada.")
-            if c_btn.button("👉 Ir al DASHBOARD"):
-                st.session_state.navegacion_radio = "MÓDULO 2: DASHBOARD (Lista de 8 Puntos)"
-                cambiar_pagina("MÓDULO 2: DASHBOARD (Lista de 8 Puntos)")
-                st.rerun()
-
-# ==============================================================================
-# MÓDULO 2: DASHBOARD (8 PUNTOS)
-# ==============================================================================
-elif modulo == "MÓDULO 2: DASHBOARD (Lista de 8 Puntos)":
-    st.markdown(f'<div class="main-header">Módulo 2: Dashboard de Desempeño</div>', unsafe_allow_html=True)
-    
-    # --- AQUÍ ESTÁ LA MAGIA PARA IMPRIMIR ---
-    # Este bloque CSS oculta botones, sidebar y menús SOLO cuando presionas Ctrl+P
-    st.markdown("""
-    <style>
-    .print-instruction {
-        background-color: #f0f2f6; border-left: 5px solid #1E3A8A;
-        padding: 10px; margin-bottom: 20px; border-radius: 5px; color: #333;
-    }
-    @media print {
-        section[data-testid="stSidebar"], header, footer, .stAppDeployButton, #MainMenu, .stButton, .print-instruction {
-            display: none !important;
-        }
-        .block-container {
-            padding: 0 !important; max-width: 100% !important;
-        }
-        * {
-            -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important;
-        }
-        div[data-testid="stMarkdownContainer"], div[data-testid="stDataFrame"], .plotly-graph-div {
-            page-break-inside: avoid !important;
-        }
-    }
-    </style>
-    
-    <div class="print-instruction">
-        ℹ️ <strong>Para exportar a PDF:</strong><br>
-        Presione las teclas <kbd>Ctrl</kbd> + <kbd>P</kbd> (o Cmd+P).<br>
-        En la ventana de impresión, elija "Guardar como PDF".
-    </div>
-    """, unsafe_allow_html=True)
-    # ----------------------------------------
-
-    dibujar_ficha(ficha)
-    st.markdown(f"#### 1. Fecha de emisión: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-
-    key_data = 'data_zona1' if contrato_seleccionado == "ZONA 1 - SECTOR CAMARONERO" else 'data_zona2'
-    df_dashboard = st.session_state[key_data].copy()
-
-    if len(df_dashboard) > 1:
-        df_final = df_dashboard.iloc[1:].reset_index(drop=True)
-    else:
-        df_final = pd.DataFrame(columns=['Fecha', 'Día N', 'Físico Diario (%)', 'Inversión Diaria ($)', 'Físico Acum (%)', 'Financiero Acum ($)', 'Saldo ($)'])
-        df_final.loc[0] = [date.today(), 'Inicio', 0, 0, 0, 0, ficha['Monto_Num']]
-
-    st.markdown("### 2. % de Avance Acumulado (Tabla Detallada)")
-    cols_mostrar = ['Fecha', 'Día N', 'Físico Diario (%)', 'Inversión Diaria ($)', 'Físico Acum (%)', 'Financiero Acum ($)', 'Saldo ($)']
-    
-    st.dataframe(
-        df_final[cols_mostrar].style.format({
-            'Físico Diario (%)': "{:.2f}%", 'Inversión Diaria ($)': "$ {:,.2f}",
-            'Físico Acum (%)': "{:.2f}%", 'Financiero Acum ($)': "$ {:,.2f}", 'Saldo ($)': "$ {:,.2f}"
-        }),
-        use_container_width=True, height=300
-    )
-
-    st.markdown("---")
-
-    c1, c2 = st.columns(2)
-    with c1:
-        st.subheader("3. Gráfico de Resumen de avance Global Acumulado")
-        fig3 = go.Figure()
-        fig3.add_trace(go.Scatter(x=df_final['Fecha'], y=df_final['Físico Acum (%)'], fill='tozeroy', name='Físico Real'))
-        st.plotly_chart(fig3, use_container_width=True)
-        
-        st.subheader("5. Gráficos de Avance de Pagos")
-        fig5 = px.line(df_final, x='Fecha', y='Financiero Acum ($)', markers=True)
-        st.plotly_chart(fig5, use_container_width=True)
-        
-        st.subheader("7. Gráfico de Pagos mensuales")
-        fig7 = px.bar(df_final, x='Fecha', y='Inversión Diaria ($)', title="Planillado Diario")
-        st.plotly_chart(fig7, use_container_width=True)
-
-    with c2:
-        st.subheader("4. Gráfico de Avance físico total por proyecto por mes")
-        fig4 = px.line(df_final, x='Fecha', y='Físico Acum (%)', markers=True)
-        st.plotly_chart(fig4, use_container_width=True)
-        
-        st.subheader("6. Gráfico de Avance porcentual y en dólares")
-        fig6 = go.Figure()
-        fig6.add_trace(go.Scatter(x=df_final['Fecha'], y=df_final['Físico Acum (%)'], name='% Avance'))
-        fig6.add_trace(go.Scatter(x=df_final['Fecha'], y=df_final['Financiero Acum ($)'], name='$ Inversión', yaxis='y2', line=dict(dash='dot')))
-        fig6.update_layout(yaxis2=dict(overlaying='y', side='right', title="Monto USD"))
-        st.plotly_chart(fig6, use_container_width=True)
-        
-        st.subheader("8. Gráfico de Devengo de anticipo")
-        fig8 = px.area(df_final, x='Fecha', y='Inversión Diaria ($)', color_discrete_sequence=['red'])
-        st.plotly_chart(fig8, use_container_width=True)
-
-
+import os
+
+# Se importa primero para medir también la carga de Streamlit, Plotly y pandas
+from perf import MedicionRerun, tamano_figura
+
+medicion = MedicionRerun()
+
+with medicion.seccion("importaciones"):
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    import plotly.graph_objects as go
+    from datetime import datetime, date
+
+    from almacen import AlmacenRDO, ConflictoVersion
+    from rdo import CLIMAS, corregir_rdo, guardar_rdo, validar_rdo
+    from dashboard import COLS_MOSTRAR, CSS_FICHA, TAMANOS_PAGINA, TITULOS_GRAFICOS, construir_dashboard, ficha_html, formato_indicador
+    from evm import valor_ganado_contrato
+    from agregacion import FRECUENCIAS
+    from contratos import RUTA_REGISTRO, cargar_registro
+    from portafolio import resumen_portafolio, totales_portafolio
+    from importacion import COLUMNAS_ARCHIVO, importar
+    from fotos import TIPOS_FOTO, guardar_foto, miniatura_disponible, miniatura_fallida, programar_miniatura, ruta_miniatura
+
+# --- CONFIGURACIÓN DE LA PÁGINA ---
+st.set_page_config(layout="wide", page_title="SISTEMA DE GESTIÓN RDO & DASHBOARD", page_icon="⚡")
+
+# --- ALMACENAMIENTO PERSISTENTE (COMPARTIDO POR TODAS LAS SESIONES) ---
+@st.cache_resource
+def obtener_almacen():
+    return AlmacenRDO()
+
+almacen = obtener_almacen()
+
+# Los gráficos y la tabla del dashboard solo se reconstruyen cuando cambia la versión
+# de los datos del contrato o el archivo de contratos (monto, plazo de la ficha);
+# se conservan los de los últimos contratos consultados.
+@st.cache_resource(max_entries=32)
+def dashboard_en_cache(codigo, version, version_registro, _ficha, frecuencia):
+    df_final, tabla, figuras = construir_dashboard(almacen.leer(codigo), _ficha, frecuencia)
+    return df_final, tabla, figuras, {n: tamano_figura(fig) for n, fig in figuras.items()}
+
+# Valor ganado de cada RDO del contrato (CPI/SPI sugeridos en el formulario), por versión
+@st.cache_resource(max_entries=32)
+def evm_en_cache(codigo, version, version_registro, _ficha):
+    return valor_ganado_contrato(almacen.leer(codigo), _ficha)
+
+# El registro se relee solo cuando cambia el archivo de contratos
+@st.cache_resource
+def obtener_registro(modificado):
+    return cargar_registro()
+
+version_registro = os.path.getmtime(RUTA_REGISTRO)
+registro = obtener_registro(version_registro)
+
+@st.cache_resource(max_entries=4)
+def portafolio_en_cache(version_global, version_registro, _registro):
+    resumen = resumen_portafolio(almacen.leer_todos(), _registro)
+    return resumen, totales_portafolio(resumen)
+
+MODULOS = [
+    "MÓDULO 1: RDO (Lista de 19 Puntos)",
+    "MÓDULO 2: DASHBOARD (Lista de 8 Puntos)",
+    "MÓDULO 3: PORTAFOLIO DE CONTRATOS",
+]
+
+# --- FUNCIÓN DE RESETEO ---
+def reset_app(codigo):
+    """Borra el historial de RDO de un solo contrato (para todas las sesiones).
+
+    Se usa como callback del botón, así que Streamlit vuelve a ejecutar la página después.
+    """
+    almacen.borrar(codigo)
+    st.session_state.confirmar_reset = False
+    st.session_state.pagina_actual = "MÓDULO 1: RDO (Lista de 19 Puntos)"
+
+# --- GESTIÓN DE MEMORIA (INICIALIZACIÓN) ---
+if 'pagina_actual' not in st.session_state:
+    st.session_state.pagina_actual = "MÓDULO 1: RDO (Lista de 19 Puntos)"
+
+def cambiar_pagina(nombre_pagina):
+    st.session_state.pagina_actual = nombre_pagina
+
+# --- ESTILOS VISUALES GENERALES ---
+st.markdown("""
+<style>
+""" + CSS_FICHA + """
+    .main-header {font-size: 24px; font-weight: bold; color: #1E3A8A; margin-bottom: 10px;}
+    .stTextInput label, .stDateInput label, .stSelectbox label, .stTextArea label, .stNumberInput label, .stSlider label {
+        font-weight: bold !important; color: #b91c1c !important; font-size: 15px !important;
+    }
+    
+    div.stButton > button:first-child {
+        border-radius: 5px;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+# --- BARRA LATERAL ---
+st.sidebar.image("https://upload.wikimedia.org/wikipedia/commons/e/e4/Logotipo_de_CNEL.svg", width=150)
+st.sidebar.title("Configuración")
+
+contrato_seleccionado = st.sidebar.selectbox(
+    "Seleccione el Contrato/Zona:",
+    list(registro)
+)
+
+st.sidebar.markdown("---")
+
+modulo = st.sidebar.radio(
+    "Navegación:", 
+    MODULOS,
+    index=MODULOS.index(st.session_state.pagina_actual),
+    key="navegacion_radio",
+    on_change=lambda: cambiar_pagina(st.session_state.navegacion_radio)
+)
+
+st.sidebar.markdown("---")
+# El borrado alcanza solo al contrato seleccionado y exige confirmación explícita
+with st.sidebar.expander("🗑️ RESETEAR RDO Y DASHBOARD"):
+    codigo_reset = registro[contrato_seleccionado]['Código']
+    confirmar_reset = st.checkbox(f"Confirmo borrar todos los RDO de {codigo_reset}", key="confirmar_reset")
+    st.button("BORRAR RDO DEL CONTRATO", disabled=not confirmar_reset, on_click=reset_app, args=(codigo_reset,),
+              help="Borra los RDO del contrato seleccionado y reinicia su dashboard")
+
+st.sidebar.info(f"**Oferente:** Consorcio FiscalRed\n**Usuario:** Fiscalizador")
+panel_rendimiento = st.sidebar.empty()
+
+# --- FICHA TÉCNICA ---
+def obtener_ficha_tecnica(zona):
+    return registro[zona]
+
+ficha = obtener_ficha_tecnica(contrato_seleccionado)
+
+def dibujar_ficha(datos):
+    st.markdown(ficha_html(datos), unsafe_allow_html=True)
+
+# ==============================================================================
+# MÓDULO 1: RDO WEB (INGRESO DIARIO)
+# ==============================================================================
+# Cada bloque es un st.fragment: sus widgets re-ejecutan solo ese bloque, no la
+# configuración, los estilos ni la barra lateral. Los datos se leen del almacén
+# dentro de cada fragmento, así un rerun parcial ve lo último que se guardó.
+
+def ir_al_dashboard():
+    st.session_state.navegacion_radio = "MÓDULO 2: DASHBOARD (Lista de 8 Puntos)"
+    cambiar_pagina("MÓDULO 2: DASHBOARD (Lista de 8 Puntos)")
+    st.session_state.ir_al_dashboard = True
+
+@st.fragment
+def fragmento_ficha(ficha, medicion):
+    with medicion.fragmento("ficha"):
+        st.markdown(f'<div class="main-header">Módulo 1: Registro Diario de Obra (RDO)</div>', unsafe_allow_html=True)
+        dibujar_ficha(ficha)
+
+        codigo = ficha['Código']
+        with st.expander("📥 Importar histórico de RDO (CSV / Excel)"):
+            st.caption("Encabezados: " + ", ".join(COLUMNAS_ARCHIVO) + ". Una fila por día, en orden cronológico y posterior al último RDO del contrato.")
+            archivo_hist = st.file_uploader("Archivo exportado", type=["csv", "xlsx"], key="archivo_historico")
+            if archivo_hist is not None and st.button("IMPORTAR HISTÓRICO"):
+                try:
+                    resultado = importar(almacen, codigo, ficha['Monto_Num'], archivo_hist, archivo_hist.name)
+                except (ValueError, RuntimeError) as e:
+                    st.error(f"⚠️ NO SE PUDO IMPORTAR: {e}")
+                else:
+                    st.session_state[f"version_vista_{codigo}"] = almacen.version(codigo)
+                    st.success(f"✅ {resultado.insertados} RDO IMPORTADOS.")
+                    rechazados = resultado.tabla_rechazados()
+                    if len(rechazados) > 0:
+                        st.warning(f"⛔ {len(rechazados)} filas rechazadas:")
+                        st.dataframe(rechazados, hide_index=True, use_container_width=True)
+                        st.download_button("Descargar filas rechazadas", rechazados.to_csv(index=False).encode("utf-8-sig"), "rechazados.csv", "text/csv")
+
+@st.fragment
+def fragmento_seleccion(ficha, medicion):
+    with medicion.fragmento("seleccion") as med:
+        modo_edicion = st.checkbox("🔓 Modificar Registro Anterior (Corrección)")
+        indice_a_editar = -1
+
+        if modo_edicion:
+            st.info("⚠️ MODO EDICIÓN: Seleccione el día a corregir.")
+            opciones = almacen.opciones_edicion(ficha['Código'])
+
+            if opciones:
+                indice_a_editar = st.selectbox("Seleccione Registro:", list(opciones), format_func=opciones.get)
+            else:
+                st.warning("No hay registros para editar.")
+
+        fragmento_formulario(ficha, modo_edicion, indice_a_editar, med)
+
+@st.fragment
+def fragmento_formulario(ficha, modo_edicion, indice_a_editar, medicion):
+    if st.session_state.pop("ir_al_dashboard", False):
+        st.rerun()
+
+    with medicion.fragmento("rdo_form") as med:
+        codigo = ficha['Código']
+        # Versión del contrato con la que se dibujó el formulario que el usuario está enviando
+        clave_version = f"version_vista_{codigo}"
+        version_vista = st.session_state.get(clave_version, almacen.version(codigo))
+        st.session_state[clave_version] = almacen.version(codigo)
+
+        defaults = {
+            "fecha": date.today(), "dia_n": "", "clima_idx": 0, "incidente_idx": 0,
+            "pct_diario": 0.0, "monto_diario": 0.0, "cpi": 0.0, "spi": 0.0,
+            "hito1": 0.0, "hito2": 0.0, "pct_total": 0.0,
+            "personal": "", "actividad": "", "firma": ""
+        }
+        evm = evm_en_cache(codigo, almacen.version(codigo), version_registro, ficha)
+
+        if modo_edicion and indice_a_editar != -1:
+            fila = almacen.obtener(codigo, indice_a_editar)
+            defaults["fecha"] = fila['Fecha']
+            defaults["dia_n"] = fila['Día N']
+            defaults["pct_diario"] = float(fila['Físico Diario (%)'])
+            defaults["monto_diario"] = float(fila['Inversión Diaria ($)'])
+            defaults["actividad"] = fila['Detalle']
+            defaults["personal"] = "Personal registrado..." 
+            defaults["firma"] = "Fiscalizador"
+            defaults["hito1"] = float(fila['Hito 1 (%)'])
+            defaults["hito2"] = float(fila['Hito 2 (%)'])
+            defaults["pct_total"] = float(fila['Porcentaje Total (%)'])
+            indicadores_evm = evm.loc[indice_a_editar]
+            fila_prev = almacen.anterior(codigo, indice_a_editar)
+        else:
+            fila_prev = almacen.ultimo(codigo)
+            # Hitos y porcentaje total son acumulados: se parte de lo último declarado
+            if fila_prev is not None:
+                defaults["hito1"] = float(fila_prev['Hito 1 (%)'])
+                defaults["hito2"] = float(fila_prev['Hito 2 (%)'])
+                defaults["pct_total"] = float(fila_prev['Porcentaje Total (%)'])
+            indicadores_evm = evm.iloc[-1] if len(evm) else None
+
+        # CPI y SPI sugeridos por el valor ganado (NaN mientras no hay costo o plan: queda 0)
+        sugerido = {"cpi": 0.0, "spi": 0.0}
+        if indicadores_evm is not None:
+            sugerido["cpi"] = round(float(indicadores_evm['CPI']), 2) if indicadores_evm['CPI'] > 0 else 0.0
+            sugerido["spi"] = round(float(indicadores_evm['SPI']), 2) if indicadores_evm['SPI'] > 0 else 0.0
+        defaults.update(sugerido)
+        # Al editar se parte de lo declarado en el RDO; el valor ganado queda solo como sugerencia
+        if modo_edicion and indice_a_editar != -1:
+            if fila['CPI Declarado'] is not None: defaults["cpi"] = float(fila['CPI Declarado'])
+            if fila['SPI Declarado'] is not None: defaults["spi"] = float(fila['SPI Declarado'])
+
+        if fila_prev is not None:
+            prev_pct_acum = float(fila_prev['Físico Acum (%)'])
+            prev_monto_acum = float(fila_prev['Financiero Acum ($)'])
+        else:
+            prev_pct_acum = 0.0
+            prev_monto_acum = 0.0
+
+        with st.form("rdo_form", clear_on_submit=False):
+            st.markdown("### A. Datos Generales")
+            c1, c2 = st.columns(2)
+            in_fecha = c1.date_input("1. Fechas de Ejecución", defaults["fecha"])
+            in_dia = c2.text_input("4. Día de ejecución (Obligatorio)", defaults["dia_n"], placeholder="Ej: Día 1")
+        
+            c3, c4 = st.columns(2)
+            c3.text_input("2. Datos Económicos del Contrato", ficha['Monto_Fiscalizacion'], disabled=True)
+            c4.text_input("3. Dato Económico total de los Proyectos", ficha['Monto_Str'], disabled=True)
+
+            st.markdown("### B. Condiciones de Campo")
+            col_clima, col_inc = st.columns(2)
+            in_clima = col_clima.selectbox("5. Condiciones climáticas (Obligatorio)", ["", *CLIMAS], index=defaults["clima_idx"])
+            in_inc = col_inc.selectbox("19. Registro de Incidentes o accidentes", ["Sin Novedades", "Incidente Leve", "Accidente"], index=defaults["incidente_idx"])
+
+            st.markdown("### C. Control de Avance")
+            st.info(f"**6. Progreso General (Ingreso de Avance del DÍA):**")
+            m1, m2, m3 = st.columns(3)
+            in_pct_diario = m1.number_input("6.i. % de Avance DEL DÍA", min_value=0.0, max_value=100.0, value=defaults["pct_diario"], step=0.01)
+            in_monto_diario = m2.number_input("6.i. $ de Avance DEL DÍA", min_value=0.0, value=defaults["monto_diario"], step=100.0)
+        
+            nuevo_acum_monto = prev_monto_acum + in_monto_diario
+            nuevo_saldo = ficha['Monto_Num'] - nuevo_acum_monto
+            m3.metric("6.i. Avance Avaluado Acumulado (Automático)", f"$ {nuevo_acum_monto:,.2f}", f"Saldo: $ {nuevo_saldo:,.2f}")
+
+            st.markdown("**6.ii. Avance prorrateado por Hito**")
+            col_h1, col_h2 = st.columns(2)
+            in_hito1 = col_h1.number_input("6.ii. Hito 1 (Civil) %", min_value=0.0, max_value=100.0, value=defaults["hito1"])
+            in_hito2 = col_h2.number_input("6.ii. Hito 2 (Eléctrico) %", min_value=0.0, max_value=100.0, value=defaults["hito2"])
+        
+            st.markdown("**7. Indicadores de Desempeño y estimaciones**")
+            col_c, col_s = st.columns(2)
+            in_cpi = col_c.number_input("7. CPI (Costo)", value=defaults["cpi"], step=0.01, help=f"Sugerido: {sugerido['cpi']:.2f} (EV / AC de los RDO guardados)")
+            in_spi = col_s.number_input("7. SPI (Cronograma)", value=defaults["spi"], step=0.01, help=f"Sugerido: {sugerido['spi']:.2f} (EV / PV según el plazo del contrato)")
+        
+            cc1, cc2 = st.columns(2)
+            cc1.selectbox("14. Control mediante Tabla de cantidades y Reporte", ["", "SI - Verificado", "NO"], index=0)
+            in_pct_total = cc2.number_input("15. Porcentaje total de los proyectos", min_value=0.0, max_value=100.0, value=defaults["pct_total"], help="Ponderado")
+
+            st.markdown("**8. Curva de Avance – Valor Ganado**")
+            with med.seccion("curva_avance"):
+                fig_rdo = go.Figure()
+                fig_rdo.add_trace(go.Bar(x=["Anterior", "Nuevo"], y=[prev_pct_acum, prev_pct_acum + in_pct_diario], name='Crecimiento'))
+                fig_rdo.update_layout(height=150, margin=dict(t=10, b=10))
+                st.plotly_chart(fig_rdo, use_container_width=True)
+
+            st.markdown("### D. Administrativo y Detalle")
+            l1, l2, l3 = st.columns(3)
+            l1.text_input("16. Registro de Contratos Complementarios", "Ninguno")
+            l2.text_input("17. Registro de Ordenes de trabajo", "")
+            l3.text_input("18. Registro de Incremento de cantidades", "0.00%")
+
+            in_personal = st.text_area("13. Personal y Equipos (Obligatorio)", defaults["personal"], placeholder="Detalle cuadrilla...")
+            in_activ = st.text_area("10. Actividades ejecutadas en el día (Obligatorio)", defaults["actividad"], placeholder="Descripción...")
+            st.text_area("9. Observaciones de fiscalización", "")
+
+            st.markdown("**11. Registro fotográfico & 12. Firmas**")
+            c_foto, c_firma = st.columns(2)
+            in_fotos = c_foto.file_uploader("11. Registro fotográfico (Obligatorio)", type=TIPOS_FOTO, accept_multiple_files=True)
+            in_firma = c_firma.text_input("12. Firmas de responsabilidad (Obligatorio)", defaults["firma"])
+
+            btn_label = "GUARDAR CAMBIOS" if modo_edicion else "GUARDAR RDO DIARIO"
+            submitted = st.form_submit_button(btn_label)
+    
+        if submitted:
+            errores = validar_rdo(
+                in_fecha, in_dia, in_clima, in_personal, in_activ, in_firma, len(in_fotos) if in_fotos else 0,
+                modo_edicion, fecha_existe=almacen.existe_fecha(codigo, in_fecha, excepto=indice_a_editar if modo_edicion else None)
+            )
+            guardado = False
+
+            if errores:
+                st.error("⚠️ NO SE PUDO GUARDAR. REVISE:")
+                for e in errores: st.write(e)
+            else:
+                # Las fotos se copian a disco por su hash solo después de guardar el RDO,
+                # para no dejar archivos sin registro si el guardado falla
+                def guardar_fotos():
+                    return list(dict.fromkeys(guardar_foto(f) for f in in_fotos)) if in_fotos else []
+
+                indicadores = {
+                    'Hito 1 (%)': in_hito1, 'Hito 2 (%)': in_hito2, 'Porcentaje Total (%)': in_pct_total,
+                    'CPI Declarado': in_cpi, 'SPI Declarado': in_spi
+                }
+
+                try:
+                    if modo_edicion:
+                        # La corrección se propaga a los acumulados y saldos de todos los días posteriores
+                        cambios = {
+                            'Fecha': in_fecha, 'Día N': in_dia, 'Físico Diario (%)': in_pct_diario,
+                            'Inversión Diaria ($)': in_monto_diario, **indicadores
+                        }
+                        # Detalle solo se carga del almacén si de verdad cambió
+                        if in_activ != defaults["actividad"]:
+                            cambios['Detalle'] = in_activ
+                        corregir_rdo(almacen, codigo, indice_a_editar, cambios, ficha['Monto_Num'], version_esperada=version_vista)
+                        fotos_guardadas = guardar_fotos()
+                        if fotos_guardadas:
+                            almacen.vincular_fotos(codigo, indice_a_editar, fotos_guardadas)
+                        mensaje_ok = f"✅ REGISTRO '{in_dia}' CORREGIDO."
+                    else:
+                        # El conteo de fotos queda exacto (sin repetidas) al vincularlas
+                        id_nuevo = guardar_rdo(
+                            almacen, codigo, in_fecha, in_dia, in_pct_diario, in_monto_diario, in_activ,
+                            len(in_fotos), ficha['Monto_Num'], indicadores
+                        )
+                        almacen.vincular_fotos(codigo, id_nuevo, guardar_fotos())
+                        mensaje_ok = f"✅ REGISTRO DEL DÍA {in_fecha} GUARDADO."
+                except ConflictoVersion:
+                    st.error("⛔ OTRO USUARIO MODIFICÓ ESTE CONTRATO MIENTRAS EDITABA. Revise los datos actualizados y vuelva a guardar.")
+                except ValueError as e:
+                    st.error(f"⚠️ NO SE PUDO GUARDAR. {e}")
+                else:
+                    st.session_state[clave_version] = almacen.version(codigo)
+                    st.success(mensaje_ok)
+                    guardado = True
+
+            if guardado:
+                st.markdown("---")
+                c_msg, c_btn = st.columns([3, 1])
+                c_msg.info("Base de datos actualizada.")
+                c_btn.button("👉 Ir al DASHBOARD", on_click=ir_al_dashboard)
+
+
+if modulo == "MÓDULO 1: RDO (Lista de 19 Puntos)":
+    fragmento_ficha(ficha, medicion)
+    fragmento_seleccion(ficha, medicion)
+
+# ==============================================================================
+# MÓDULO 2: DASHBOARD (8 PUNTOS)
+# ==============================================================================
+elif modulo == "MÓDULO 2: DASHBOARD (Lista de 8 Puntos)":
+    st.markdown(f'<div class="main-header">Módulo 2: Dashboard de Desempeño</div>', unsafe_allow_html=True)
+    
+    # --- AQUÍ ESTÁ LA MAGIA PARA IMPRIMIR ---
+    # Este bloque CSS oculta botones, sidebar y menús SOLO cuando presionas Ctrl+P
+    st.markdown("""
+    <style>
+    .print-instruction {
+        background-color: #f0f2f6; border-left: 5px solid #1E3A8A;
+        padding: 10px; margin-bottom: 20px; border-radius: 5px; color: #333;
+    }
+    @media print {
+        section[data-testid="stSidebar"], header, footer, .stAppDeployButton, #MainMenu, .stButton, .print-instruction {
+            display: none !important;
+        }
+        .block-container {
+            padding: 0 !important; max-width: 100% !important;
+        }
+        * {
+            -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important;
+        }
+        div[data-testid="stMarkdownContainer"], div[data-testid="stDataFrame"], .plotly-graph-div {
+            page-break-inside: avoid !important;
+        }
+    }
+    </style>
+    
+    <div class="print-instruction">
+        ℹ️ <strong>Para exportar a PDF:</strong><br>
+        Presione las teclas <kbd>Ctrl</kbd> + <kbd>P</kbd> (o Cmd+P).<br>
+        En la ventana de impresión, elija "Guardar como PDF".
+    </div>
+    """, unsafe_allow_html=True)
+    # ----------------------------------------
+
+    with medicion.seccion("ficha"):
+        dibujar_ficha(ficha)
+    st.markdown(f"#### 1. Fecha de emisión: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+
+    codigo = ficha['Código']
+    frecuencia = st.radio("Agrupación de los gráficos 4 y 7:", list(FRECUENCIAS), index=2, horizontal=True)
+    with medicion.seccion("dashboard_build") as m:
+        df_final, tabla, figuras, bytes_figuras = dashboard_en_cache(codigo, almacen.version(codigo), version_registro, ficha, frecuencia)
+        m['filas'] = len(df_final)
+        m['bytes_memoria'] = int(df_final.memory_usage(deep=True).sum())
+
+    def mostrar_figura(n):
+        with medicion.seccion(f"grafico_{n}", filas=len(df_final), bytes=bytes_figuras[n]):
+            st.plotly_chart(figuras[n], use_container_width=True)
+
+    # La tabla llega paginada y ya formateada desde el almacén: paginar, ordenar o
+    # filtrar re-ejecuta solo este fragmento y su costo depende del tamaño de página.
+    @st.fragment
+    def fragmento_tabla(codigo, df_final, tabla, medicion):
+        with medicion.fragmento("tabla") as med:
+            total_contrato = almacen.contar(codigo)
+            if total_contrato == 0:
+                # Sin RDO: solo la fila 'Inicio' del dashboard
+                st.dataframe(tabla, use_container_width=True, hide_index=True)
+                return
+
+            f1, f2, f3, f4 = st.columns([2, 2, 1, 1])
+            primera, ultima = df_final['Fecha'].min().date(), df_final['Fecha'].max().date()
+            rango = f1.date_input("Rango de fechas", (primera, ultima), key=f"tabla_rango_{codigo}_{primera}_{ultima}")
+            desde, hasta = rango if len(rango) == 2 else (rango[0], None)
+            orden = f2.selectbox("Ordenar por", COLS_MOSTRAR, key=f"tabla_orden_{codigo}")
+            descendente = f3.toggle("Descendente", key=f"tabla_desc_{codigo}")
+            tam_pagina = f4.selectbox("Filas", TAMANOS_PAGINA, index=1, key="tabla_tam_pagina")
+
+            total = almacen.contar(codigo, desde, hasta)
+            n_paginas = max(1, -(-total // tam_pagina))
+            pagina = st.number_input(
+                f"Página (de {n_paginas})", min_value=1, max_value=n_paginas, value=1,
+                key=f"tabla_pagina_{codigo}_{desde}_{hasta}_{tam_pagina}",
+            )
+            inicio = (pagina - 1) * tam_pagina
+            with med.seccion("tabla_pagina", filas=tam_pagina) as m:
+                filas = almacen.pagina(codigo, inicio, tam_pagina, orden, descendente, desde, hasta)
+                m['filas'] = len(filas)
+            st.dataframe(filas, use_container_width=True, hide_index=True, height=300)
+            st.caption(f"Filas {min(inicio + 1, total)}–{inicio + len(filas)} de {total} ({total_contrato} RDO en el contrato)")
+
+    st.markdown("### 2. % de Avance Acumulado (Tabla Detallada)")
+    fragmento_tabla(codigo, df_final, tabla, medicion)
+
+    st.markdown("---")
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.subheader(TITULOS_GRAFICOS[3])
+        mostrar_figura(3)
+        
+        st.subheader(TITULOS_GRAFICOS[5])
+        mostrar_figura(5)
+        
+        st.subheader(TITULOS_GRAFICOS[7])
+        mostrar_figura(7)
+
+    with c2:
+        st.subheader(TITULOS_GRAFICOS[4])
+        mostrar_figura(4)
+        
+        st.subheader(TITULOS_GRAFICOS[6])
+        mostrar_figura(6)
+        
+        st.subheader(TITULOS_GRAFICOS[8])
+        mostrar_figura(8)
+
+    st.subheader(TITULOS_GRAFICOS[9])
+    actual = df_final.iloc[-1]
+    e1, e2, e3, e4 = st.columns(4)
+    e1.metric("CPI (EV / AC)", formato_indicador(actual['CPI']))
+    e2.metric("SPI (EV / PV)", formato_indicador(actual['SPI']))
+    e3.metric("EAC (Estimado al término)", formato_indicador(actual['EAC ($)'], "$ {:,.2f}"))
+    e4.metric("ETC (Por gastar)", formato_indicador(actual['ETC ($)'], "$ {:,.2f}"))
+    mostrar_figura(9)
+
+    st.markdown("---")
+    st.markdown("### 11. Registro fotográfico")
+    # Solo se leen miniaturas, y solo las del RDO elegido
+    opciones_fotos = almacen.opciones_edicion(codigo)
+    if opciones_fotos and st.toggle("Mostrar fotos del RDO"):
+        id_rdo = st.selectbox("RDO:", list(opciones_fotos), format_func=opciones_fotos.get, index=len(opciones_fotos) - 1)
+        fotos_rdo = almacen.fotos_de(codigo, id_rdo)
+        if not fotos_rdo:
+            st.caption("Este RDO no tiene fotos registradas.")
+        columnas_fotos = st.columns(4)
+        for i, (hash_foto, extension) in enumerate(fotos_rdo):
+            with columnas_fotos[i % 4]:
+                if miniatura_disponible(hash_foto):
+                    st.image(ruta_miniatura(hash_foto), use_container_width=True)
+                elif miniatura_fallida(hash_foto):
+                    st.caption(f"🖼️ Vista previa no disponible ({extension or 'sin extensión'})")
+                else:
+                    programar_miniatura(hash_foto, extension)
+                    st.caption("⏳ Miniatura en proceso...")
+
+
+# ==============================================================================
+# MÓDULO 3: PORTAFOLIO DE CONTRATOS
+# ==============================================================================
+elif modulo == "MÓDULO 3: PORTAFOLIO DE CONTRATOS":
+    st.markdown(f'<div class="main-header">Módulo 3: Portafolio de Contratos</div>', unsafe_allow_html=True)
+    st.markdown(f"#### Fecha de emisión: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+
+    with medicion.seccion("portafolio") as m:
+        resumen, totales = portafolio_en_cache(almacen.version_global(), version_registro, registro)
+        m['filas'] = len(resumen)
+        m['bytes_memoria'] = int(resumen.memory_usage(deep=True).sum())
+
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("Contratos", f"{totales['Contratos']}")
+    k2.metric("Avance Físico Global", f"{totales['Físico (%)']:.2f}%")
+    k3.metric("Avance Financiero Global", f"{totales['Financiero (%)']:.2f}%")
+    k4.metric("Saldo Total", f"$ {totales['Saldo ($)']:,.2f}")
+
+    st.markdown("### Ranking de avance por contrato")
+    st.dataframe(
+        resumen[['Ranking', 'Código', 'Nombre', 'Contratista', 'RDO', 'Último RDO', 'Físico Acum (%)', 'Financiero (%)', 'Financiero Acum ($)', 'Saldo ($)', 'CPI', 'SPI', 'EAC ($)', 'Monto_Num']],
+        column_config={
+            'Último RDO': st.column_config.DateColumn('Último RDO', format="YYYY-MM-DD"),
+            'Físico Acum (%)': st.column_config.ProgressColumn('Físico Acum (%)', format="%.2f%%", min_value=0, max_value=100),
+            'Financiero (%)': st.column_config.NumberColumn('Financiero (%)', format="%.2f%%"),
+            'Financiero Acum ($)': st.column_config.NumberColumn('Financiero Acum ($)', format="$ %,.2f"),
+            'Saldo ($)': st.column_config.NumberColumn('Saldo ($)', format="$ %,.2f"),
+            'CPI': st.column_config.NumberColumn('CPI', format="%.2f"),
+            'SPI': st.column_config.NumberColumn('SPI', format="%.2f"),
+            'EAC ($)': st.column_config.NumberColumn('EAC ($)', format="$ %,.2f"),
+            'Monto_Num': st.column_config.NumberColumn('Monto ($)', format="$ %,.2f"),
+        },
+        hide_index=True, use_container_width=True,
+    )
+
+
+# ==============================================================================
+# PANEL DE RENDIMIENTO (tiempos de este rerun, también en datos/perf.jsonl)
+# ==============================================================================
+ctx = get_script_run_ctx()
+registro_perf = medicion.cerrar(
+    sesion=ctx.session_id if ctx else None, pagina=modulo, contrato=ficha['Código']
+)
+with panel_rendimiento.container():
+    with st.expander(f"⏱️ Rendimiento: {registro_perf['total_ms']:.0f} ms"):
+        st.dataframe(registro_perf['secciones'], hide_index=True, use_container_width=True)
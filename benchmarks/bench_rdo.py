@@ -0,0 +1,192 @@
+"""Benchmarks sin interfaz de las rutas de guardado, corrección, selector y dashboard.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_rdo                       # escenarios rápidos
+    python -m benchmarks.bench_rdo --escenarios 1000x365 # cartera completa
+    python -m benchmarks.bench_rdo --comparar benchmarks/resultados/anterior.json
+
+Cada escenario genera contratos sintéticos "NxDÍAS", los carga en un almacén
+temporal y mide cada ruta. Los resultados se escriben en JSON para compararlos
+entre corridas; con --comparar se marcan las rutas que empeoran más que --umbral.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from almacen import AlmacenRDO
+from dashboard import construir_dashboard
+from evm import valor_ganado
+from portafolio import resumen_portafolio
+from rdo import corregir_rdo, guardar_rdo, validar_rdo
+
+ESCENARIOS_RAPIDOS = ["1x150", "10x365", "100x365"]
+CARPETA_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+MONTO = 450000.0
+INICIO = date(2025, 1, 1)
+
+
+def generar_contrato_sintetico(n_dias, semilla=0, monto=MONTO):
+    """Historial plausible de un contrato: avance diario con ruido que llega cerca del 100%."""
+    rng = np.random.default_rng(semilla)
+    pct = rng.gamma(2.0, 100.0 / (2.0 * n_dias), n_dias)
+    costo = pct / 100 * monto * rng.normal(1.0, 0.05, n_dias).clip(0.5)
+    df = pd.DataFrame({
+        'Fecha': [INICIO + timedelta(days=i) for i in range(n_dias)],
+        'Día N': [f"Día {i + 1}" for i in range(n_dias)],
+        'Físico Diario (%)': pct.round(2),
+        'Inversión Diaria ($)': costo.round(2),
+        'Detalle': "Tendido de red de media tensión y montaje de postes",
+        'Fotos': rng.integers(1, 6, n_dias),
+    })
+    df['Físico Acum (%)'] = df['Físico Diario (%)'].cumsum().clip(upper=100.0)
+    df['Financiero Acum ($)'] = df['Inversión Diaria ($)'].cumsum().clip(upper=monto)
+    df['Saldo ($)'] = monto - df['Financiero Acum ($)']
+    return df
+
+
+def _medir(funcion, repeticiones):
+    """Tiempos en ms de `repeticiones` llamadas: mediana, mínimo y máximo."""
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return {'mediana_ms': statistics.median(tiempos), 'min_ms': min(tiempos), 'max_ms': max(tiempos), 'n': repeticiones}
+
+
+def correr_escenario(nombre, repeticiones=5):
+    n_contratos, n_dias = (int(x) for x in nombre.split("x"))
+    resultados = {}
+    with tempfile.TemporaryDirectory() as carpeta:
+        almacen = AlmacenRDO(os.path.join(carpeta, "bench.sqlite"))
+        registro = {}
+        t0 = time.perf_counter()
+        for i in range(n_contratos):
+            codigo = f"SINT-{i:04d}"
+            registro[codigo] = {'Nombre': codigo, 'Código': codigo, 'Contratista': "Sintético",
+                                'Monto_Num': MONTO, 'Plazo_Dias': n_dias}
+            almacen.agregar_lote(codigo, generar_contrato_sintetico(n_dias, semilla=i))
+        resultados['carga_lote'] = {'total_ms': (time.perf_counter() - t0) * 1000, 'filas': n_contratos * n_dias}
+
+        codigo = "SINT-0000"
+        ficha = registro[codigo]
+
+        # Guardado: validación + fila nueva + inserción al final de un historial de n_dias
+        siguiente = [INICIO + timedelta(days=n_dias + 10)]
+
+        def guardar():
+            fecha = siguiente[0]
+            siguiente[0] += timedelta(days=1)
+            validar_rdo(fecha, "Día X", "Soleado", "Cuadrilla", "Actividad", "Fiscalizador", 1,
+                        fecha_existe=almacen.existe_fecha(codigo, fecha))
+            guardar_rdo(almacen, codigo, fecha, "Día X", 0.1, 100.0, "Actividad", 1, MONTO)
+        resultados['guardar'] = _medir(guardar, max(repeticiones, 20))
+
+        # Corrección del día 3 con propagación hasta el final
+        id_dia3 = list(almacen.opciones_edicion(codigo))[2]
+        resultados['editar_dia3'] = _medir(
+            lambda: corregir_rdo(almacen, codigo, id_dia3, {'Físico Diario (%)': 1.5}, MONTO), repeticiones
+        )
+
+        # Memoria del historial de un contrato: esquema tipado sin 'Detalle' frente a objetos Python con todo
+        resultados['memoria_contrato'] = {
+            'bytes': int(almacen.leer(codigo).memory_usage(deep=True).sum()),
+            'bytes_objetos': int(almacen.leer(codigo, detalle=True).astype(object).memory_usage(deep=True).sum()),
+        }
+
+        # Selector de edición: primera construcción del índice y consultas posteriores
+        def opciones_en_frio():
+            almacen._indices.pop(codigo, None)
+            almacen.opciones_edicion(codigo)
+        resultados['opciones_frio'] = _medir(opciones_en_frio, repeticiones)
+        resultados['opciones'] = _medir(lambda: almacen.opciones_edicion(codigo), repeticiones)
+
+        # Dashboard de un contrato: lectura, figuras y formateo completo de la tabla (como en los reportes)
+        def dashboard():
+            _, tabla, _ = construir_dashboard(almacen.leer(codigo), ficha)
+            tabla.to_html()
+        resultados['dashboard'] = _medir(dashboard, repeticiones)
+
+        # Tabla del dashboard: última página de 50 filas, ordenada por saldo
+        resultados['tabla_pagina'] = _medir(
+            lambda: almacen.pagina(codigo, max(n_dias - 50, 0), 50, 'Saldo ($)', True), repeticiones
+        )
+
+        resultados['portafolio'] = _medir(lambda: resumen_portafolio(almacen.leer_todos(), registro), repeticiones)
+        todos = almacen.leer_todos()
+        resultados['valor_ganado'] = _medir(lambda: valor_ganado(todos, registro), repeticiones)
+        almacen.cerrar()
+    return resultados
+
+
+def comparar(actual, anterior, umbral):
+    """Líneas de comparación por ruta y lista de regresiones (cociente > 1 + umbral)."""
+    lineas, regresiones = [], []
+    for escenario, rutas in actual['escenarios'].items():
+        previas = anterior.get('escenarios', {}).get(escenario, {})
+        for ruta, medida in rutas.items():
+            clave = 'mediana_ms' if 'mediana_ms' in medida else 'total_ms'
+            if ruta not in previas or clave not in previas[ruta]:
+                continue
+            antes, ahora = previas[ruta][clave], medida[clave]
+            cociente = ahora / antes if antes else float('inf')
+            marca = "  ⛔" if cociente > 1 + umbral else ""
+            lineas.append(f"{escenario:>9} {ruta:<14} {antes:10.2f} ms -> {ahora:10.2f} ms  x{cociente:.2f}{marca}")
+            if marca:
+                regresiones.append((escenario, ruta, cociente))
+    return lineas, regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de las rutas de datos del RDO y el dashboard.")
+    parser.add_argument("--escenarios", nargs="+", default=ESCENARIOS_RAPIDOS, help="Contratos x días, p. ej. 1x150 1000x365")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto: benchmarks/resultados/<fecha>.json)")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    parser.add_argument("--umbral", type=float, default=0.2, help="Empeoramiento tolerado al comparar (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    actual = {
+        'fecha': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'escenarios': {},
+    }
+    for escenario in args.escenarios:
+        print(f"▶ {escenario}...", flush=True)
+        actual['escenarios'][escenario] = correr_escenario(escenario, args.repeticiones)
+        for ruta, medida in actual['escenarios'][escenario].items():
+            if 'bytes' in medida:
+                print(f"    {ruta:<14} {medida['bytes'] / 1024:10.1f} KiB (objetos: {medida['bytes_objetos'] / 1024:.1f} KiB)")
+                continue
+            valor = medida.get('mediana_ms', medida.get('total_ms'))
+            print(f"    {ruta:<14} {valor:10.2f} ms")
+
+    salida = args.salida or os.path.join(CARPETA_RESULTADOS, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(actual, f, indent=2, ensure_ascii=False)
+    print(f"Resultados: {salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+        lineas, regresiones = comparar(actual, anterior, args.umbral)
+        print("\n".join(lineas))
+        if regresiones:
+            print(f"⛔ {len(regresiones)} rutas empeoraron más de {args.umbral:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
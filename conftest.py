@@ -0,0 +1 @@
+# Los módulos de la app están en la raíz del repositorio; pytest la agrega a sys.path por este archivo.
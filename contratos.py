@@ -0,0 +1,48 @@
+"""Registro de contratos supervisados (fichas técnicas leídas de un archivo local)."""
+import json
+import os
+
+RUTA_REGISTRO = os.environ.get(
+    "RDO_CONTRATOS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "contratos.json")
+)
+
+CAMPOS_OBLIGATORIOS = ["Nombre", "Código", "Monto_Num", "Plazo_Dias"]
+
+# Campos que solo se muestran (ficha técnica, formulario y portafolio): si faltan se completan
+CAMPOS_OPCIONALES = {
+    "Entidad": "—", "Categoría": "—", "Objeto": "—", "Contratista": "—", "Rep_Legal": "—", "Link": "",
+    "Monto_Fiscalizacion": "—",
+}
+
+
+def completar_ficha(entrada):
+    """Ficha con los campos de presentación que falten; 'Plazo' y 'Monto_Str' salen de los numéricos."""
+    return {
+        **CAMPOS_OPCIONALES,
+        "Plazo": f"{entrada['Plazo_Dias']} Días Calendario",
+        "Monto_Str": "$ " + f"{entrada['Monto_Num']:,.2f}".translate(str.maketrans(",.", ".,")),
+        **entrada,
+    }
+
+
+def cargar_registro(ruta=RUTA_REGISTRO):
+    """{Nombre visible: ficha técnica} en el orden del archivo.
+
+    Cada entrada del JSON es la ficha técnica de un contrato; el 'Código' es la
+    clave con la que se guardan sus RDO. Solo CAMPOS_OBLIGATORIOS son exigidos;
+    el resto se completa con `completar_ficha`.
+    """
+    with open(ruta, encoding="utf-8") as f:
+        entradas = json.load(f)
+
+    registro = {}
+    codigos = set()
+    for entrada in entradas:
+        faltantes = [campo for campo in CAMPOS_OBLIGATORIOS if campo not in entrada]
+        if faltantes:
+            raise ValueError(f"Contrato sin {', '.join(faltantes)} en {ruta}: {entrada}")
+        if entrada["Código"] in codigos or entrada["Nombre"] in registro:
+            raise ValueError(f"Contrato duplicado en {ruta}: {entrada['Código']}")
+        codigos.add(entrada["Código"])
+        registro[entrada["Nombre"]] = completar_ficha(entrada)
+    return registro
@@ -0,0 +1,142 @@
+"""Construcción de la tabla y los gráficos del Módulo 2 a partir del historial de un contrato."""
+from datetime import date
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from agregacion import agregar, reducir, usa_webgl
+from almacen import COLUMNAS, FORMATOS as FORMATOS_SQL, tipar
+from evm import valor_ganado_contrato
+
+COLS_MOSTRAR = ['Fecha', 'Día N', 'Físico Diario (%)', 'Inversión Diaria ($)', 'Físico Acum (%)', 'Financiero Acum ($)', 'Saldo ($)']
+# Los mismos formatos con que el almacén guarda el texto de la tabla paginada
+FORMATOS = {COLUMNAS[col]: formato for col, formato in FORMATOS_SQL.items()}
+TAMANOS_PAGINA = [25, 50, 100]
+
+CSS_FICHA = """
+    .ficha-tecnica {
+        width: 100%; border-collapse: collapse; margin-bottom: 20px; font-family: Arial, sans-serif; font-size: 12px; border: 1px solid #ddd;
+    }
+    .ficha-tecnica th {background-color: #1E3A8A; color: white; padding: 6px; text-align: left; border: 1px solid #ddd;}
+    .ficha-tecnica td {padding: 6px; border: 1px solid #ddd; background-color: #f9f9f9; color: #333;}
+"""
+
+TITULOS_GRAFICOS = {
+    3: "3. Gráfico de Resumen de avance Global Acumulado",
+    4: "4. Gráfico de Avance físico total por proyecto por mes",
+    5: "5. Gráficos de Avance de Pagos",
+    6: "6. Gráfico de Avance porcentual y en dólares",
+    7: "7. Gráfico de Pagos mensuales",
+    8: "8. Gráfico de Devengo de anticipo",
+    9: "9. Curva de Valor Ganado (PV, EV, AC)",
+}
+
+
+def ficha_html(datos):
+    """Tabla HTML de la ficha técnica del contrato (clase CSS 'ficha-tecnica')."""
+    return f"""
+    <table class="ficha-tecnica">
+        <tr><th colspan="4" style="text-align:center;">FICHA TÉCNICA DEL PROYECTO (CONTRATO DE OBRA)</th></tr>
+        <tr>
+            <td width="15%"><strong>Entidad:</strong></td><td width="35%">{datos['Entidad']}</td>
+            <td width="15%"><strong>Categoría:</strong></td><td width="35%">{datos['Categoría']}</td>
+        </tr>
+        <tr>
+            <td><strong>Objeto:</strong></td><td colspan="3">{datos['Objeto']}</td>
+        </tr>
+        <tr>
+            <td><strong>Código:</strong></td><td>{datos['Código']}</td>
+            <td><strong>Plazo:</strong></td><td>{datos['Plazo']}</td>
+        </tr>
+        <tr>
+            <td><strong>Contratista:</strong></td><td>{datos['Contratista']}</td>
+            <td><strong>Rep. Legal:</strong></td><td>{datos['Rep_Legal']}</td>
+        </tr>
+        <tr>
+            <td><strong>Monto USD:</strong></td><td>{datos['Monto_Str']}</td>
+            <td><strong>Link:</strong></td><td><a href="{datos['Link']}" target="_blank">Ver en SERCOP</a></td>
+        </tr>
+    </table>
+    """
+
+
+def preparar_df_final(df_historial, ficha):
+    """Historial listo para graficar, con sus columnas de valor ganado; si aún no hay RDO, una fila 'Inicio'."""
+    if len(df_historial) > 0:
+        df_final = df_historial.reset_index(drop=True)
+    else:
+        df_final = tipar(pd.DataFrame([[date.today(), 'Inicio', 0.0, 0.0, 0.0, 0.0, ficha['Monto_Num']]], columns=COLS_MOSTRAR))
+    # Columnas nuevas sobre el mismo DataFrame, sin copiar las del historial
+    for col, serie in valor_ganado_contrato(df_final, ficha).items():
+        df_final[col] = serie.to_numpy()
+    return df_final
+
+
+def formato_indicador(valor, formato="{:.2f}"):
+    """Texto de un indicador EVM; '—' mientras no se puede calcular (NaN)."""
+    return "—" if pd.isna(valor) else formato.format(valor)
+
+
+def construir_tabla(df_final):
+    """2. % de Avance Acumulado completa, con formato de moneda y porcentaje (reportes)."""
+    return df_final[COLS_MOSTRAR].style.format({'Fecha': "{:%Y-%m-%d}", **FORMATOS})
+
+
+TITULOS_PLANILLA = {'Día': "Planillado Diario", 'Semana': "Planillado Semanal", 'Mes': "Planillado Mensual"}
+
+
+def _scatter(n_puntos):
+    """go.Scattergl para series largas, go.Scatter (SVG) para el resto."""
+    return go.Scattergl if usa_webgl(n_puntos) else go.Scatter
+
+
+def construir_figuras(df_final, frecuencia='Mes'):
+    """Gráficos 3 a 9 del dashboard, indexados por su número de punto.
+
+    Los gráficos "por mes" (4 y 7) usan la serie agregada según `frecuencia`; el
+    resto grafica la serie diaria reducida con LTTB si supera MAX_PUNTOS. El 9 es
+    la curva de valor ganado (PV, EV, AC) de las columnas EVM de `df_final`.
+    """
+    # plotly.express tarda más en importarse que el resto del módulo; solo se carga al abrir el dashboard
+    import plotly.express as px
+
+    agregado = agregar(df_final, frecuencia)
+
+    d3 = reducir(df_final, 'Fecha', 'Físico Acum (%)')
+    fig3 = go.Figure()
+    fig3.add_trace(_scatter(len(d3))(x=d3['Fecha'], y=d3['Físico Acum (%)'], fill='tozeroy', name='Físico Real'))
+
+    fig4 = px.line(agregado, x='Fecha', y='Físico Acum (%)', markers=True)
+
+    d5 = reducir(df_final, 'Fecha', 'Financiero Acum ($)')
+    fig5 = px.line(d5, x='Fecha', y='Financiero Acum ($)', markers=True, render_mode='webgl' if usa_webgl(len(d5)) else 'svg')
+
+    d6_pct = reducir(df_final, 'Fecha', 'Físico Acum (%)')
+    d6_usd = reducir(df_final, 'Fecha', 'Financiero Acum ($)')
+    fig6 = go.Figure()
+    fig6.add_trace(_scatter(len(d6_pct))(x=d6_pct['Fecha'], y=d6_pct['Físico Acum (%)'], name='% Avance'))
+    fig6.add_trace(_scatter(len(d6_usd))(x=d6_usd['Fecha'], y=d6_usd['Financiero Acum ($)'], name='$ Inversión', yaxis='y2', line=dict(dash='dot')))
+    fig6.update_layout(yaxis2=dict(overlaying='y', side='right', title="Monto USD"))
+
+    fig7 = px.bar(agregado, x='Fecha', y='Inversión Diaria ($)', title=TITULOS_PLANILLA[frecuencia])
+
+    d8 = reducir(df_final, 'Fecha', 'Inversión Diaria ($)')
+    fig8 = go.Figure()
+    fig8.add_trace(_scatter(len(d8))(x=d8['Fecha'], y=d8['Inversión Diaria ($)'], fill='tozeroy', line=dict(color='red')))
+    fig8.update_layout(xaxis_title='Fecha', yaxis_title='Inversión Diaria ($)')
+
+    fig9 = go.Figure()
+    for col, nombre, estilo in [('PV ($)', 'PV (Planificado)', dict(dash='dash')),
+                                ('EV ($)', 'EV (Ganado)', dict()),
+                                ('AC ($)', 'AC (Costo Real)', dict(dash='dot'))]:
+        d9 = reducir(df_final, 'Fecha', col)
+        fig9.add_trace(_scatter(len(d9))(x=d9['Fecha'], y=d9[col], name=nombre, line=estilo))
+    fig9.update_layout(xaxis_title='Fecha', yaxis_title='USD')
+
+    return {3: fig3, 4: fig4, 5: fig5, 6: fig6, 7: fig7, 8: fig8, 9: fig9}
+
+
+def construir_dashboard(df_historial, ficha, frecuencia='Mes'):
+    """Todo lo que dibuja el Módulo 2 para un contrato: (df_final, tabla, figuras)."""
+    df_final = preparar_df_final(df_historial, ficha)
+    return df_final, construir_tabla(df_final), construir_figuras(df_final, frecuencia)
@@ -0,0 +1,52 @@
+"""Valor ganado (EVM) de los contratos: PV, EV, AC, CPI, SPI y pronósticos EAC/ETC.
+
+La línea base de cada contrato es lineal: el monto (BAC) repartido en partes
+iguales a lo largo de 'Plazo_Dias', contado desde 'Fecha_Inicio' de la ficha
+técnica (opcional, AAAA-MM-DD) o, si no la tiene, desde su primer RDO.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNAS_EVM = ['PV ($)', 'EV ($)', 'AC ($)', 'CPI', 'SPI', 'EAC ($)', 'ETC ($)', 'VAC ($)']
+
+
+def linea_base(dias, plazo_dias, monto):
+    """Valor planificado (PV) acumulado tras `dias` días de plazo, topado en el monto."""
+    return np.clip(dias / plazo_dias, 0.0, 1.0) * monto
+
+
+def valor_ganado(df_rdo, registro):
+    """Columnas EVM de cada fila de `df_rdo`, para todos sus contratos a la vez.
+
+    `df_rdo` trae la columna 'contrato' (código), 'Fecha' y los acumulados físico
+    y financiero, como `AlmacenRDO.leer_todos`. EV es el avance físico acumulado
+    valorizado al monto del contrato y AC el financiero acumulado. CPI = EV/AC,
+    SPI = EV/PV, EAC = BAC/CPI, ETC = EAC - AC y VAC = BAC - EAC; los índices y
+    pronósticos quedan en NaN mientras su denominador sea cero.
+    """
+    fichas = pd.DataFrame(list(registro.values())).set_index('Código')
+    contrato = df_rdo['contrato']
+    bac = contrato.map(fichas['Monto_Num']).astype(float)
+    plazo = contrato.map(fichas['Plazo_Dias']).astype(float)
+
+    fechas = pd.to_datetime(df_rdo['Fecha'])
+    inicio = fechas.groupby(contrato, observed=True).transform('min')
+    if 'Fecha_Inicio' in fichas:
+        inicio = pd.to_datetime(contrato.map(fichas['Fecha_Inicio'])).fillna(inicio)
+    dias = (fechas - inicio).dt.days + 1
+
+    pv = linea_base(dias, plazo, bac)
+    ev = df_rdo['Físico Acum (%)'].astype(float) / 100 * bac
+    ac = df_rdo['Financiero Acum ($)'].astype(float)
+    cpi = ev / ac.where(ac > 0)
+    spi = ev / pv.where(pv > 0)
+    eac = bac / cpi.where(cpi > 0)
+    return pd.DataFrame({
+        'PV ($)': pv, 'EV ($)': ev, 'AC ($)': ac, 'CPI': cpi, 'SPI': spi,
+        'EAC ($)': eac, 'ETC ($)': eac - ac, 'VAC ($)': bac - eac,
+    }, index=df_rdo.index)
+
+
+def valor_ganado_contrato(df_historial, ficha):
+    """Columnas EVM del historial de un solo contrato (mismo índice que `df_historial`)."""
+    return valor_ganado(df_historial.assign(contrato=ficha['Código']), {ficha['Nombre']: ficha})
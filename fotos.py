@@ -0,0 +1,114 @@
+"""Registro fotográfico: fotos guardadas por su hash de contenido y miniaturas en segundo plano."""
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+from almacen import RUTA_DATOS
+
+try:
+    from pillow_heif import register_heif_opener
+except ImportError:  # sin pillow-heif las fotos HEIC se guardan, pero sin miniatura
+    pass
+else:
+    register_heif_opener()
+
+RUTA_FOTOS = os.path.join(RUTA_DATOS, "fotos")
+TAM_MINIATURA = (320, 320)
+TAM_BLOQUE = 1 << 20
+
+# Extensiones aceptadas por el cargador del formulario (Módulo 1)
+TIPOS_FOTO = ["jpg", "jpeg", "png", "heic", "heif", "webp"]
+
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="miniaturas")
+_pendientes = {}
+_lock = threading.Lock()
+
+
+def _ruta(tipo, hash_foto, extension):
+    return os.path.join(RUTA_FOTOS, tipo, hash_foto[:2], hash_foto + extension)
+
+
+def ruta_original(hash_foto, extension):
+    return _ruta("originales", hash_foto, extension)
+
+
+def ruta_miniatura(hash_foto):
+    return _ruta("miniaturas", hash_foto, ".jpg")
+
+
+def _ruta_fallo(hash_foto):
+    return _ruta("miniaturas", hash_foto, ".error")
+
+
+def guardar_foto(archivo):
+    """Copia el archivo subido a disco por bloques y devuelve (hash, extensión).
+
+    La ruta final depende solo del contenido: una foto repetida se guarda una vez.
+    """
+    extension = os.path.splitext(getattr(archivo, "name", ""))[1].lower()
+    os.makedirs(os.path.join(RUTA_FOTOS, "originales"), exist_ok=True)
+    sha = hashlib.sha256()
+    archivo.seek(0)
+    with tempfile.NamedTemporaryFile(dir=os.path.join(RUTA_FOTOS, "originales"), delete=False) as tmp:
+        while bloque := archivo.read(TAM_BLOQUE):
+            sha.update(bloque)
+            tmp.write(bloque)
+    hash_foto = sha.hexdigest()
+
+    destino = ruta_original(hash_foto, extension)
+    if os.path.exists(destino):
+        os.remove(tmp.name)
+    else:
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        os.replace(tmp.name, destino)
+    programar_miniatura(hash_foto, extension)
+    return hash_foto, extension
+
+
+def _generar_miniatura(hash_foto, extension):
+    destino = ruta_miniatura(hash_foto)
+    try:
+        if os.path.exists(destino):
+            return destino
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        tmp = destino + ".tmp"
+        try:
+            with Image.open(ruta_original(hash_foto, extension)) as img:
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail(TAM_MINIATURA)
+                img.convert("RGB").save(tmp, "JPEG", quality=80)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            # Formato no soportado o archivo dañado: se marca para no reintentarla en cada rerun
+            with open(_ruta_fallo(hash_foto), "w", encoding="utf-8") as f:
+                f.write(f"{type(e).__name__}: {e}\n")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return None
+        os.replace(tmp, destino)
+        return destino
+    finally:
+        with _lock:
+            _pendientes.pop(hash_foto, None)
+
+
+def programar_miniatura(hash_foto, extension):
+    """Encola la miniatura en el pool de hilos (una sola vez por foto) y devuelve el Future."""
+    with _lock:
+        futuro = _pendientes.get(hash_foto)
+        if futuro is None and not miniatura_disponible(hash_foto) and not miniatura_fallida(hash_foto):
+            futuro = _pool.submit(_generar_miniatura, hash_foto, extension)
+            _pendientes[hash_foto] = futuro
+        return futuro
+
+
+def miniatura_disponible(hash_foto):
+    return os.path.exists(ruta_miniatura(hash_foto))
+
+
+def miniatura_fallida(hash_foto):
+    """True si la miniatura no pudo generarse (la foto original se conserva igual)."""
+    return os.path.exists(_ruta_fallo(hash_foto))
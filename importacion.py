@@ -0,0 +1,176 @@
+"""Importación masiva de RDO históricos desde exportaciones CSV/Excel, por bloques.
+
+El archivo debe tener una fila por día, en orden cronológico, con los encabezados
+de COLUMNAS_ARCHIVO; las fechas van como AAAA-MM-DD o DD/MM/AAAA. Los acumulados
+se encadenan en orden de registro, así que solo se aceptan días posteriores al
+último RDO del contrato (y a las filas anteriores del archivo). Se aplican
+las mismas reglas del formulario del Módulo 1 (salvo el registro fotográfico,
+que las exportaciones no traen) como operaciones sobre columnas completas de
+cada bloque.
+"""
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from rdo import CLIMAS, acumular
+
+TAM_BLOQUE = 5000
+
+# Encabezado en el archivo -> columna del RDO ('Clima', 'Personal' y 'Firma' solo se validan)
+COLUMNAS_ARCHIVO = {
+    'Fecha': 'Fecha',
+    'Día N': 'Día N',
+    'Clima': None,
+    'Personal': None,
+    'Actividades': 'Detalle',
+    'Firma': None,
+    'Físico Diario (%)': 'Físico Diario (%)',
+    'Inversión Diaria ($)': 'Inversión Diaria ($)',
+}
+
+# Columna obligatoria -> mensaje, igual que en el formulario
+OBLIGATORIOS = {
+    'Día N': "Falta: 4. Día de ejecución",
+    'Clima': "Falta: 5. Condiciones climáticas",
+    'Personal': "Falta: 13. Personal y Equipos",
+    'Actividades': "Falta: 10. Actividades Ejecutadas",
+    'Firma': "Falta: 12. Firmas de responsabilidad",
+}
+
+
+@dataclass
+class ResultadoImportacion:
+    insertados: int = 0
+    rechazados: list = field(default_factory=list)
+
+    def tabla_rechazados(self):
+        """Filas rechazadas con su número de fila en el archivo y los motivos."""
+        if not self.rechazados:
+            return pd.DataFrame(columns=['Fila', 'Fecha', 'Día N', 'Motivo'])
+        return pd.concat(self.rechazados, ignore_index=True)
+
+
+def leer_por_bloques(archivo, nombre, tam_bloque=TAM_BLOQUE):
+    """Genera DataFrames de a lo sumo `tam_bloque` filas, sin cargar el archivo completo."""
+    extension = os.path.splitext(nombre)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:
+            raise RuntimeError("La importación de Excel requiere el paquete 'openpyxl'") from e
+        libro = load_workbook(archivo, read_only=True, data_only=True)
+        try:
+            filas = libro.active.iter_rows(values_only=True)
+            encabezado = [str(c).strip() if c is not None else "" for c in next(filas, [])]
+            bloque = []
+            for fila in filas:
+                bloque.append(fila)
+                if len(bloque) == tam_bloque:
+                    yield pd.DataFrame(bloque, columns=encabezado)
+                    bloque = []
+            if bloque:
+                yield pd.DataFrame(bloque, columns=encabezado)
+        finally:
+            libro.close()
+    elif extension == ".csv":
+        yield from pd.read_csv(archivo, chunksize=tam_bloque, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    else:
+        raise ValueError(f"Formato no soportado: {nombre} (use .csv o .xlsx)")
+
+
+def validar_bloque(bloque, fechas_existentes, fecha_minima=None):
+    """Serie de motivos de rechazo por fila ('' si la fila es válida) y el bloque normalizado.
+
+    `fecha_minima` es la fecha del último RDO ya registrado: las filas de esa fecha
+    o anteriores, y las que retroceden respecto de una fila válida previa del
+    bloque, se rechazan para no romper los acumulados.
+    """
+    faltantes = [col for col in COLUMNAS_ARCHIVO if col not in bloque.columns]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el archivo: {', '.join(faltantes)}")
+
+    bloque = bloque[list(COLUMNAS_ARCHIVO)].copy()
+    texto = bloque[list(OBLIGATORIOS)].astype("string").fillna("").apply(lambda col: col.str.strip())
+    bloque[list(OBLIGATORIOS)] = texto
+
+    motivos = pd.Series("", index=bloque.index, dtype=object)
+    for col, mensaje in OBLIGATORIOS.items():
+        motivos += np.where(texto[col] == "", mensaje + "; ", "")
+    motivos += np.where((texto['Clima'] != "") & ~texto['Clima'].isin(CLIMAS), "Clima no válido; ", "")
+
+    fechas = leer_fechas(bloque['Fecha'])
+    motivos += np.where(fechas.isna(), "Fecha no válida; ", "")
+    bloque['Fecha'] = fechas.dt.date
+
+    for col in ['Físico Diario (%)', 'Inversión Diaria ($)']:
+        valores = pd.to_numeric(bloque[col], errors="coerce")
+        motivos += np.where(valores.isna() | (valores < 0), f"{col} no válido; ", "")
+        bloque[col] = valores.fillna(0.0)
+    motivos += np.where(bloque['Físico Diario (%)'] > 100, "Físico Diario (%) mayor a 100; ", "")
+
+    # Al final: una fila rechazada por otro motivo no debe "ocupar" su fecha dentro del bloque
+    valida = motivos == ""
+    duplicada = fechas.notna() & bloque['Fecha'].isin(fechas_existentes)
+    duplicada |= valida & bloque['Fecha'].where(valida).duplicated()
+    motivos += np.where(duplicada, "La fecha ya existe; ", "")
+
+    valida &= ~duplicada
+    tope = fechas.where(valida).cummax().shift()
+    if fecha_minima is not None:
+        tope = tope.fillna(pd.Timestamp(fecha_minima)).clip(lower=pd.Timestamp(fecha_minima))
+    motivos += np.where(valida & (fechas <= tope), "Fecha anterior al último RDO; ", "")
+
+    return motivos.str.rstrip("; "), bloque
+
+
+def leer_fechas(columna):
+    """Fechas AAAA-MM-DD (o celdas de fecha de Excel) y, si no, DD/MM/AAAA; NaT si no es ninguna."""
+    texto = columna.astype("string").str.strip().str.replace(r"[ T]00:00:00$", "", regex=True)
+    iso = pd.to_datetime(texto, format="%Y-%m-%d", errors="coerce")
+    return iso.fillna(pd.to_datetime(texto, format="%d/%m/%Y", errors="coerce"))
+
+
+def importar(almacen, contrato, monto_contrato, archivo, nombre, tam_bloque=TAM_BLOQUE):
+    """Valida e inserta el archivo bloque a bloque, continuando los acumulados del contrato."""
+    resultado = ResultadoImportacion()
+    fechas_existentes = almacen.fechas(contrato)
+    ultimo = almacen.ultimo(contrato)
+    fecha_minima = ultimo['Fecha'] if ultimo else None
+    fila_inicial = 2  # fila 1 = encabezado
+
+    for bloque in leer_por_bloques(archivo, nombre, tam_bloque):
+        bloque.index = pd.RangeIndex(fila_inicial, fila_inicial + len(bloque))
+        fila_inicial += len(bloque)
+
+        motivos, bloque = validar_bloque(bloque, fechas_existentes, fecha_minima)
+        rechazo = motivos != ""
+        if rechazo.any():
+            rechazados = bloque.loc[rechazo, ['Fecha', 'Día N']].assign(Motivo=motivos[rechazo])
+            resultado.rechazados.append(rechazados.rename_axis('Fila').reset_index())
+
+        validos = bloque.loc[~rechazo].rename(columns={k: v for k, v in COLUMNAS_ARCHIVO.items() if v})
+        if validos.empty:
+            continue
+        validos = validos[[v for v in COLUMNAS_ARCHIVO.values() if v]]
+
+        # Los acumulados continúan el último RDO leído en la transacción del hilo escritor,
+        # aunque otra sesión haya guardado mientras se validaba el bloque
+        def construir(ultimo, validos=validos):
+            if ultimo and ultimo['Fecha'] >= validos['Fecha'].iloc[0]:
+                raise ValueError(f"⛔ OTRO USUARIO REGISTRÓ EL {ultimo['Fecha'].strftime('%d/%m/%Y')} DURANTE LA IMPORTACIÓN.")
+            prev_pct = float(ultimo['Físico Acum (%)']) if ultimo else 0.0
+            prev_monto = float(ultimo['Financiero Acum ($)']) if ultimo else 0.0
+            pct_acum, monto_acum, saldo = acumular(
+                validos['Físico Diario (%)'], validos['Inversión Diaria ($)'], prev_pct, prev_monto, monto_contrato
+            )
+            return validos.assign(**{
+                'Físico Acum (%)': pct_acum, 'Financiero Acum ($)': monto_acum, 'Saldo ($)': saldo, 'Fotos': 0,
+            })
+
+        resultado.insertados += almacen.agregar_lote_sobre_ultimo(contrato, construir)
+        fechas_existentes.update(validos['Fecha'])
+        fecha_minima = validos['Fecha'].iloc[-1]
+
+    return resultado
@@ -0,0 +1,79 @@
+"""Medición de tiempos por sección de cada rerun de Streamlit, con registro en JSONL.
+
+Solo usa la biblioteca estándar para poder importarse antes que Plotly/pandas y
+medir también esas importaciones.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+RUTA_LOG = os.environ.get(
+    "RDO_PERF_LOG",
+    os.path.join(os.environ.get("RDO_DATOS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos")), "perf.jsonl"),
+)
+
+_lock_log = threading.Lock()
+
+
+class MedicionRerun:
+    """Acumula las secciones cronometradas de un rerun y las escribe al terminar."""
+
+    def __init__(self, ruta_log=RUTA_LOG):
+        self.ruta_log = ruta_log
+        self.inicio = time.perf_counter()
+        self.secciones = []
+        self.contexto = {}
+        self.cerrado = False
+
+    @contextmanager
+    def seccion(self, nombre, **metricas):
+        """Cronometra el bloque; las métricas (filas, bytes...) se pueden completar dentro con el dict devuelto."""
+        datos = dict(metricas)
+        t0 = time.perf_counter()
+        try:
+            yield datos
+        finally:
+            self.secciones.append({'seccion': nombre, 'ms': round((time.perf_counter() - t0) * 1000, 3), **datos})
+
+    @contextmanager
+    def fragmento(self, nombre, **contexto):
+        """Cronometra el cuerpo de un st.fragment; devuelve la medición donde anotar sus secciones.
+
+        En un rerun completo es una sección más de este rerun. Cuando el fragmento
+        se re-ejecuta solo, este rerun ya se cerró: se registra uno aparte con
+        `fragmento=nombre` y el mismo contexto (sesión, página, contrato).
+        """
+        if not self.cerrado:
+            with self.seccion(nombre):
+                yield self
+            return
+        parcial = MedicionRerun(self.ruta_log)
+        try:
+            yield parcial
+        finally:
+            parcial.cerrar(**{**self.contexto, **contexto, 'fragmento': nombre})
+
+    def cerrar(self, **contexto):
+        """Cierra el rerun, agrega el registro al log JSONL y lo devuelve."""
+        self.cerrado = True
+        self.contexto.update(contexto)
+        registro = {
+            'ts': datetime.now().isoformat(timespec="milliseconds"),
+            **self.contexto,
+            'total_ms': round((time.perf_counter() - self.inicio) * 1000, 3),
+            'secciones': self.secciones,
+        }
+        if self.ruta_log:
+            os.makedirs(os.path.dirname(self.ruta_log), exist_ok=True)
+            linea = json.dumps(registro, ensure_ascii=False, default=str)
+            with _lock_log, open(self.ruta_log, "a", encoding="utf-8") as f:
+                f.write(linea + "\n")
+        return registro
+
+
+def tamano_figura(fig):
+    """Bytes del JSON que se envía al navegador para una figura de Plotly."""
+    return len(fig.to_json())
@@ -0,0 +1,50 @@
+"""Resumen de avance de todos los contratos del registro (Módulo 3)."""
+import pandas as pd
+
+from evm import valor_ganado
+
+
+def resumen_portafolio(df_rdo, registro):
+    """Avance físico, financiero, saldo y ranking por contrato en una sola agrupación.
+
+    `df_rdo` trae todas las filas almacenadas con su columna 'contrato', en orden
+    de registro; los contratos sin RDO aparecen con avance cero. CPI, SPI y EAC
+    son los del último RDO de cada contrato.
+    """
+    fichas = pd.DataFrame(list(registro.values()))[['Código', 'Nombre', 'Contratista', 'Monto_Num', 'Plazo_Dias']]
+
+    df_rdo = df_rdo.join(valor_ganado(df_rdo, registro)[['CPI', 'SPI', 'EAC ($)']])
+    grupos = df_rdo.groupby('contrato', sort=False, observed=True)
+    avance = pd.DataFrame({
+        'RDO': grupos.size(),
+        'Último RDO': grupos['Fecha'].max(),
+        'Físico Acum (%)': grupos['Físico Acum (%)'].last(),
+        'Financiero Acum ($)': grupos['Financiero Acum ($)'].last(),
+        'CPI': grupos['CPI'].last(),
+        'SPI': grupos['SPI'].last(),
+        'EAC ($)': grupos['EAC ($)'].last(),
+    })
+
+    resumen = fichas.merge(avance, left_on='Código', right_index=True, how='left')
+    resumen[['RDO', 'Físico Acum (%)', 'Financiero Acum ($)']] = (
+        resumen[['RDO', 'Físico Acum (%)', 'Financiero Acum ($)']].fillna(0)
+    )
+    resumen['RDO'] = resumen['RDO'].astype(int)
+    resumen['Financiero (%)'] = resumen['Financiero Acum ($)'] / resumen['Monto_Num'] * 100
+    resumen['Saldo ($)'] = resumen['Monto_Num'] - resumen['Financiero Acum ($)']
+    resumen['Ranking'] = resumen['Físico Acum (%)'].rank(ascending=False, method='min').astype(int)
+    return resumen.sort_values(['Ranking', 'Código']).reset_index(drop=True)
+
+
+def totales_portafolio(resumen):
+    """Avance global ponderado por monto de contrato."""
+    monto_total = resumen['Monto_Num'].sum()
+    if monto_total == 0:
+        return {'Contratos': len(resumen), 'Monto ($)': 0.0, 'Físico (%)': 0.0, 'Financiero (%)': 0.0, 'Saldo ($)': 0.0}
+    return {
+        'Contratos': len(resumen),
+        'Monto ($)': monto_total,
+        'Físico (%)': (resumen['Físico Acum (%)'] * resumen['Monto_Num']).sum() / monto_total,
+        'Financiero (%)': resumen['Financiero Acum ($)'].sum() / monto_total * 100,
+        'Saldo ($)': resumen['Saldo ($)'].sum(),
+    }
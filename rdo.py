@@ -0,0 +1,114 @@
+"""Cálculos sobre el historial de RDO de un contrato."""
+import pandas as pd
+
+from almacen import ConflictoVersion, FechaRepetida
+
+COL_PCT_DIARIO = 'Físico Diario (%)'
+COL_MONTO_DIARIO = 'Inversión Diaria ($)'
+COL_PCT_ACUM = 'Físico Acum (%)'
+COL_MONTO_ACUM = 'Financiero Acum ($)'
+COL_SALDO = 'Saldo ($)'
+COLUMNAS_ACUMULADAS = [COL_PCT_ACUM, COL_MONTO_ACUM, COL_SALDO]
+
+CLIMAS = ["Soleado", "Nublado", "Lluvia", "Tormenta"]
+
+
+def acumular(pct_diario, monto_diario, prev_pct, prev_monto, monto_contrato):
+    """(Físico Acum, Financiero Acum, Saldo) de una serie de días a partir de los acumulados previos.
+
+    Aplica los mismos topes que el formulario: 100% para el físico y el monto del
+    contrato para el financiero.
+    """
+    # Se acumula en float64 aunque los porcentajes lleguen en float32
+    pct_acum = (prev_pct + pct_diario.astype('float64').cumsum()).clip(upper=100.0)
+    monto_acum = (prev_monto + monto_diario.astype('float64').cumsum()).clip(upper=monto_contrato)
+    return pct_acum, monto_acum, monto_contrato - monto_acum
+
+
+def recalcular_acumulados(df, desde, monto_contrato):
+    """Recalcula acumulados y saldo desde la posición `desde` hasta el final, en una sola pasada.
+
+    Devuelve una copia con los mismos tipos; las filas anteriores a `desde` no se modifican.
+    """
+    df = df.copy()
+    if desde > 0:
+        prev_pct = float(df[COL_PCT_ACUM].iloc[desde - 1])
+        prev_monto = float(df[COL_MONTO_ACUM].iloc[desde - 1])
+    else:
+        prev_pct = 0.0
+        prev_monto = 0.0
+
+    tramo = df.iloc[desde:]
+    acumulados = acumular(tramo[COL_PCT_DIARIO], tramo[COL_MONTO_DIARIO], prev_pct, prev_monto, monto_contrato)
+    for pos, serie in zip(df.columns.get_indexer(COLUMNAS_ACUMULADAS), acumulados):
+        df.iloc[desde:, pos] = serie.to_numpy(dtype=df.dtypes.iloc[pos])
+    return df
+
+
+def validar_rdo(fecha, dia, clima, personal, actividad, firma, n_fotos, modo_edicion=False, fecha_existe=False):
+    """Mensajes de error del formulario del Módulo 1 (lista vacía si el RDO puede guardarse)."""
+    errores = []
+    if not dia: errores.append("• Falta: 4. Día de ejecución")
+    if clima == "": errores.append("• Falta: 5. Condiciones climáticas")
+    if not personal: errores.append("• Falta: 13. Personal y Equipos")
+    if not actividad: errores.append("• Falta: 10. Actividades Ejecutadas")
+    if not firma: errores.append("• Falta: 12. Firmas de responsabilidad")
+    if not modo_edicion and not n_fotos: errores.append("• Falta: 11. Registro fotográfico")
+    if fecha_existe:
+        errores.append(f"⛔ LA FECHA {fecha.strftime('%d/%m/%Y')} YA EXISTE.")
+    return errores
+
+
+def nueva_fila(fecha, dia, pct_diario, monto_diario, detalle, n_fotos, prev_pct, prev_monto, monto_contrato):
+    """Fila de un RDO nuevo con sus acumulados y saldo (mismos topes que `acumular`)."""
+    pct_acum = min(prev_pct + pct_diario, 100.0)
+    monto_acum = min(prev_monto + monto_diario, monto_contrato)
+    return {
+        'Fecha': fecha, 'Día N': dia, COL_PCT_DIARIO: pct_diario,
+        COL_MONTO_DIARIO: monto_diario, COL_PCT_ACUM: pct_acum,
+        COL_MONTO_ACUM: monto_acum, COL_SALDO: monto_contrato - monto_acum,
+        'Detalle': detalle, 'Fotos': n_fotos
+    }
+
+
+def guardar_rdo(almacen, contrato, fecha, dia, pct_diario, monto_diario, detalle, n_fotos, monto_contrato,
+                indicadores=None):
+    """Agrega un RDO con sus acumulados sobre el último RDO guardado; devuelve su id.
+
+    `indicadores` son las columnas declaradas en el formulario que se guardan tal
+    cual (hitos, porcentaje total, CPI, SPI). Los acumulados se calculan en el hilo
+    escritor del almacén, con el último RDO leído en la misma transacción, así dos
+    fiscalizadores que guardan a la vez no se pisan ni reciben un conflicto. Lanza
+    FechaRepetida (ValueError) si la fecha ya fue registrada.
+    """
+    def construir(ultimo):
+        prev_pct = float(ultimo[COL_PCT_ACUM]) if ultimo else 0.0
+        prev_monto = float(ultimo[COL_MONTO_ACUM]) if ultimo else 0.0
+        fila = nueva_fila(fecha, dia, pct_diario, monto_diario, detalle, n_fotos, prev_pct, prev_monto, monto_contrato)
+        fila.update(indicadores or {})
+        return fila
+    return almacen.agregar_sobre_ultimo(contrato, construir)
+
+
+def corregir_rdo(almacen, contrato, id_rdo, cambios, monto_contrato, version_esperada=None):
+    """Aplica `cambios` a un RDO guardado y propaga acumulados y saldos a los días posteriores.
+
+    `version_esperada` es la versión del contrato que vio el usuario al elegir el
+    RDO; si otra sesión escribió después, se lanza ConflictoVersion en lugar de
+    sobrescribir datos más nuevos. Lanza FechaRepetida si la nueva fecha ya es de
+    otro RDO. Devuelve el tramo reescrito.
+    """
+    version = almacen.version(contrato)
+    if version_esperada is not None and version != version_esperada:
+        raise ConflictoVersion(contrato, version_esperada, version)
+    if 'Fecha' in cambios and almacen.existe_fecha(contrato, cambios['Fecha'], excepto=id_rdo):
+        raise FechaRepetida(cambios['Fecha'])
+    df = almacen.leer(contrato, detalle='Detalle' in cambios)
+    for col, val in cambios.items():
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and val not in df[col].cat.categories:
+            df[col] = df[col].cat.add_categories([val])
+        df.at[id_rdo, col] = pd.Timestamp(val) if col == 'Fecha' else val
+    desde = df.index.get_loc(id_rdo)
+    tramo = recalcular_acumulados(df, desde, monto_contrato).iloc[desde:]
+    almacen.actualizar_lote(contrato, tramo, version_esperada=version)
+    return tramo
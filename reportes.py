@@ -0,0 +1,162 @@
+"""Reportes estáticos del dashboard (Módulo 2) para todos los contratos, generados en paralelo.
+
+Uso:
+    python reportes.py --salida reportes --formato html --procesos 4
+
+Cada reporte lleva la ficha técnica, la fecha de emisión, la tabla de avance y
+los gráficos 3 a 9 como imágenes PNG incrustadas. Las imágenes requieren
+`kaleido` 1.x, que a su vez usa un Google Chrome/Chromium instalado; si el
+equipo no tiene uno, instalarlo una vez con:
+
+    plotly_get_chrome
+
+El formato PDF convierte ese mismo HTML con `weasyprint`, que es opcional.
+"""
+import argparse
+import base64
+import html
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from agregacion import FRECUENCIAS
+from almacen import RUTA_DB, AlmacenRDO
+from contratos import cargar_registro
+from dashboard import CSS_FICHA, TITULOS_GRAFICOS, construir_dashboard, ficha_html
+
+ANCHO_IMAGEN = 900
+ALTO_IMAGEN = 450
+
+ESTILO_REPORTE = CSS_FICHA + """
+    body {font-family: Arial, sans-serif; color: #333; margin: 24px;}
+    h1 {font-size: 22px; color: #1E3A8A;}
+    h2 {font-size: 16px; color: #1E3A8A; margin-top: 24px;}
+    table.avance {border-collapse: collapse; width: 100%; font-size: 11px;}
+    table.avance th, table.avance td {border: 1px solid #ddd; padding: 4px; text-align: right;}
+    table.avance th {background-color: #1E3A8A; color: white;}
+    .grafico {page-break-inside: avoid;}
+    .grafico img {width: 100%; max-width: 900px;}
+"""
+
+# Conexión propia de cada proceso del pool
+_almacen = None
+
+
+def _obtener_almacen(ruta_db):
+    global _almacen
+    if _almacen is None:
+        _almacen = AlmacenRDO(ruta_db)
+    return _almacen
+
+
+def _imagen(fig):
+    png = fig.to_image(format="png", width=ANCHO_IMAGEN, height=ALTO_IMAGEN)
+    return f'<img src="data:image/png;base64,{base64.b64encode(png).decode("ascii")}">'
+
+
+def html_reporte(ficha, df_final, tabla, figuras, emision):
+    """Documento HTML autocontenido con los 9 puntos del dashboard."""
+    graficos = "\n".join(
+        f'<div class="grafico"><h2>{TITULOS_GRAFICOS[n]}</h2>{_imagen(figuras[n])}</div>'
+        for n in sorted(figuras)
+    )
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>Reporte {html.escape(ficha['Código'])}</title>
+<style>{ESTILO_REPORTE}</style>
+</head>
+<body>
+<h1>Dashboard de Desempeño - {html.escape(ficha['Nombre'])}</h1>
+{ficha_html(ficha)}
+<h2>1. Fecha de emisión: {emision.strftime('%d/%m/%Y %H:%M')}</h2>
+<h2>2. % de Avance Acumulado (Tabla Detallada)</h2>
+{tabla.hide(axis="index").set_table_attributes('class="avance"').to_html()}
+{graficos}
+</body>
+</html>
+"""
+
+
+def verificar_exportacion():
+    """Lanza RuntimeError si kaleido no puede exportar imágenes (falta el paquete o Chrome)."""
+    import plotly.graph_objects as go
+    try:
+        go.Figure().to_image(format="png", width=10, height=10)
+    except (ImportError, ValueError) as e:
+        # plotly informa la falta de kaleido con ValueError; la de Chrome ya llega como RuntimeError
+        raise RuntimeError("Las imágenes de los reportes requieren el paquete 'kaleido' (pip install -r requirements.txt)") from e
+
+
+def generar_reporte(ficha, carpeta, formato="html", frecuencia="Mes", ruta_db=RUTA_DB):
+    """Genera el reporte de un contrato y devuelve la ruta del archivo escrito."""
+    almacen = _obtener_almacen(ruta_db)
+    emision = datetime.now()
+    df_final, tabla, figuras = construir_dashboard(almacen.leer(ficha['Código']), ficha, frecuencia)
+    documento = html_reporte(ficha, df_final, tabla, figuras, emision)
+
+    nombre = f"{ficha['Código']}_{emision.strftime('%Y-%m')}"
+    if formato == "pdf":
+        try:
+            from weasyprint import HTML
+        except ImportError as e:
+            raise RuntimeError("El formato PDF requiere el paquete 'weasyprint'") from e
+        ruta = os.path.join(carpeta, nombre + ".pdf")
+        HTML(string=documento).write_pdf(ruta)
+    else:
+        ruta = os.path.join(carpeta, nombre + ".html")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(documento)
+    return ruta
+
+
+def generar_todos(registro, carpeta, formato="html", frecuencia="Mes", procesos=None, ruta_db=RUTA_DB):
+    """Reparte los contratos en un pool de procesos; devuelve ({código: ruta}, {código: error})."""
+    os.makedirs(carpeta, exist_ok=True)
+    generados, errores = {}, {}
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = {
+            pool.submit(generar_reporte, ficha, carpeta, formato, frecuencia, ruta_db): ficha['Código']
+            for ficha in registro.values()
+        }
+        for futuro in as_completed(futuros):
+            codigo = futuros[futuro]
+            try:
+                generados[codigo] = futuro.result()
+            except Exception as e:
+                errores[codigo] = e
+    return generados, errores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera los reportes del dashboard de todos los contratos.")
+    parser.add_argument("--salida", default="reportes", help="Carpeta de destino (por defecto: reportes)")
+    parser.add_argument("--formato", choices=["html", "pdf"], default="html")
+    parser.add_argument("--frecuencia", choices=list(FRECUENCIAS), default="Mes", help="Agrupación de los gráficos 4 y 7")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos del pool (por defecto: núcleos disponibles)")
+    parser.add_argument("--contrato", action="append", help="Limita el lote a estos códigos (se puede repetir)")
+    args = parser.parse_args(argv)
+
+    registro = cargar_registro()
+    if args.contrato:
+        registro = {nombre: f for nombre, f in registro.items() if f['Código'] in args.contrato}
+
+    # Sin Chrome cada proceso fallaría con el mismo error: se avisa una sola vez
+    try:
+        verificar_exportacion()
+    except RuntimeError as e:
+        print(f"⛔ {str(e).strip()}", file=sys.stderr)
+        return 1
+
+    generados, errores = generar_todos(registro, args.salida, args.formato, args.frecuencia, args.procesos)
+    for codigo, ruta in sorted(generados.items()):
+        print(f"✅ {codigo}: {ruta}")
+    for codigo, error in sorted(errores.items()):
+        print(f"⛔ {codigo}: {error}", file=sys.stderr)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
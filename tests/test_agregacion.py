@@ -0,0 +1,40 @@
+from datetime import date
+
+import pandas as pd
+
+from agregacion import agregar
+
+
+def _historial(fechas, diarios):
+    acumulado = pd.Series(diarios).cumsum()
+    return pd.DataFrame({
+        'Fecha': fechas, 'Físico Diario (%)': diarios, 'Inversión Diaria ($)': [d * 10 for d in diarios],
+        'Físico Acum (%)': acumulado, 'Financiero Acum ($)': acumulado * 10, 'Saldo ($)': 1000 - acumulado * 10,
+    })
+
+
+def test_semanas_empiezan_en_lunes_y_se_etiquetan_con_el():
+    # Miércoles 1 a domingo 5 de enero, lunes 6 y domingo 12, lunes 13
+    df = _historial([date(2025, 1, 1), date(2025, 1, 5), date(2025, 1, 6), date(2025, 1, 12), date(2025, 1, 13)],
+                    [1.0, 2.0, 3.0, 4.0, 5.0])
+    semanas = agregar(df, 'Semana')
+    assert list(semanas['Fecha']) == [pd.Timestamp(2024, 12, 30), pd.Timestamp(2025, 1, 6), pd.Timestamp(2025, 1, 13)]
+    assert list(semanas['Físico Diario (%)']) == [3.0, 7.0, 5.0]
+    assert list(semanas['Físico Acum (%)']) == [3.0, 10.0, 15.0]
+
+
+def test_meses_y_periodos_vacios():
+    df = _historial([date(2025, 1, 31), date(2025, 3, 1)], [1.0, 2.0])
+    meses = agregar(df, 'Mes')
+    assert list(meses['Fecha']) == [pd.Timestamp(2025, 1, 1), pd.Timestamp(2025, 2, 1), pd.Timestamp(2025, 3, 1)]
+    assert list(meses['Físico Diario (%)']) == [1.0, 0.0, 2.0]
+    # Febrero no tiene RDO: conserva el acumulado y el saldo de enero
+    assert list(meses['Físico Acum (%)']) == [1.0, 1.0, 3.0]
+    assert list(meses['Saldo ($)']) == [990.0, 990.0, 970.0]
+
+
+def test_dias():
+    df = _historial([date(2025, 1, 1), date(2025, 1, 3)], [1.0, 2.0])
+    dias = agregar(df, 'Día')
+    assert len(dias) == 3
+    assert list(dias['Físico Acum (%)']) == [1.0, 1.0, 3.0]
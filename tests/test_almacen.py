@@ -0,0 +1,27 @@
+from datetime import date, timedelta
+
+import pytest
+
+from almacen import AlmacenRDO
+from rdo import guardar_rdo
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    almacen = AlmacenRDO(str(tmp_path / "rdo.db"))
+    for i in range(12):
+        guardar_rdo(almacen, "C-1", date(2025, 1, 1) + timedelta(days=i), f"Día {i + 1}", 1.0, 10.0 * (12 - i),
+                    "Actividad", 1, 10_000.0)
+    yield almacen
+    almacen.cerrar()
+
+
+def test_pagina_ordena_dia_n_por_registro(almacen):
+    assert almacen.pagina("C-1", 0, 4, 'Día N')['Día N'].tolist() == ["Día 1", "Día 2", "Día 3", "Día 4"]
+    assert almacen.pagina("C-1", 0, 3, 'Día N', descendente=True)['Día N'].tolist() == ["Día 12", "Día 11", "Día 10"]
+
+
+def test_pagina_ordena_por_valor_y_filtra_fechas(almacen):
+    pagina = almacen.pagina("C-1", 0, 3, 'Inversión Diaria ($)', desde=date(2025, 1, 3), hasta=date(2025, 1, 8))
+    assert pagina['Día N'].tolist() == ["Día 8", "Día 7", "Día 6"]
+    assert almacen.contar("C-1", date(2025, 1, 3), date(2025, 1, 8)) == 6
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from almacen import AlmacenRDO
+from contratos import cargar_registro
+from dashboard import ficha_html
+from portafolio import resumen_portafolio
+
+
+def _registro(tmp_path, entradas):
+    ruta = tmp_path / "contratos.json"
+    ruta.write_text(json.dumps(entradas), encoding="utf-8")
+    return cargar_registro(str(ruta))
+
+
+def test_ficha_minima_se_completa(tmp_path):
+    registro = _registro(tmp_path, [{"Nombre": "Zona 1", "Código": "C-1", "Monto_Num": 399743.03, "Plazo_Dias": 150}])
+    ficha = registro["Zona 1"]
+    assert ficha["Monto_Str"] == "$ 399.743,03"
+    assert ficha["Plazo"] == "150 Días Calendario"
+    assert ficha["Monto_Fiscalizacion"] == "—"
+    assert "C-1" in ficha_html(ficha)
+    almacen = AlmacenRDO(str(tmp_path / "rdo.db"))
+    try:
+        assert resumen_portafolio(almacen.leer_todos(), registro)['Contratista'].tolist() == ["—"]
+    finally:
+        almacen.cerrar()
+
+
+def test_campos_declarados_se_respetan(tmp_path):
+    registro = _registro(tmp_path, [{"Nombre": "Zona 1", "Código": "C-1", "Monto_Num": 10.0, "Plazo_Dias": 5,
+                                     "Contratista": "Consorcio", "Monto_Str": "$ 10"}])
+    assert registro["Zona 1"]["Contratista"] == "Consorcio"
+    assert registro["Zona 1"]["Monto_Str"] == "$ 10"
+
+
+def test_falta_campo_obligatorio(tmp_path):
+    with pytest.raises(ValueError, match="Plazo_Dias"):
+        _registro(tmp_path, [{"Nombre": "Zona 1", "Código": "C-1", "Monto_Num": 10.0}])
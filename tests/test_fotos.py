@@ -0,0 +1,47 @@
+import io
+
+import pytest
+from PIL import Image
+
+import fotos
+
+
+@pytest.fixture(autouse=True)
+def ruta_fotos(tmp_path, monkeypatch):
+    monkeypatch.setattr(fotos, "RUTA_FOTOS", str(tmp_path / "fotos"))
+
+
+def _subida(nombre, contenido):
+    archivo = io.BytesIO(contenido)
+    archivo.name = nombre
+    return archivo
+
+
+def _esperar(hash_foto, extension):
+    # guardar_foto ya encoló la miniatura: devuelve el mismo Future, o None si ya terminó
+    futuro = fotos.programar_miniatura(hash_foto, extension)
+    if futuro is not None:
+        futuro.result()
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), "orange").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_miniatura_de_foto_valida():
+    hash_foto, extension = fotos.guardar_foto(_subida("obra.png", _png()))
+    assert extension == ".png"
+    _esperar(hash_foto, extension)
+    assert fotos.miniatura_disponible(hash_foto)
+    with Image.open(fotos.ruta_miniatura(hash_foto)) as img:
+        assert max(img.size) <= max(fotos.TAM_MINIATURA)
+
+
+def test_miniatura_fallida_no_se_reintenta():
+    hash_foto, extension = fotos.guardar_foto(_subida("obra.jpg", b"no es una imagen"))
+    _esperar(hash_foto, extension)
+    assert fotos.miniatura_fallida(hash_foto)
+    assert not fotos.miniatura_disponible(hash_foto)
+    assert fotos.programar_miniatura(hash_foto, extension) is None
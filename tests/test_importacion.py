@@ -0,0 +1,75 @@
+import io
+from datetime import date
+
+import pandas as pd
+
+from almacen import AlmacenRDO
+from importacion import COLUMNAS_ARCHIVO, importar, validar_bloque
+from rdo import guardar_rdo
+
+
+def _bloque(filas):
+    base = {'Día N': "Día 1", 'Clima': "Soleado", 'Personal': "Cuadrilla", 'Actividades': "Postes",
+            'Firma': "Fiscalizador", 'Físico Diario (%)': "1.5", 'Inversión Diaria ($)': "100"}
+    return pd.DataFrame([{**base, **fila} for fila in filas], columns=list(COLUMNAS_ARCHIVO), dtype=str)
+
+
+def test_fechas_iso_y_dia_mes_anio():
+    bloque = _bloque([{'Fecha': "2025-01-02"}, {'Fecha': "2025-01-13"}, {'Fecha': "14/01/2025"}, {'Fecha': "03/02/2025"}])
+    motivos, normalizado = validar_bloque(bloque, set())
+    assert list(motivos) == ["", "", "", ""]
+    assert list(normalizado['Fecha']) == [date(2025, 1, 2), date(2025, 1, 13), date(2025, 1, 14), date(2025, 2, 3)]
+
+
+def test_fecha_no_valida():
+    motivos, _ = validar_bloque(_bloque([{'Fecha': "2025-13-01"}, {'Fecha': "ayer"}]), set())
+    assert all("Fecha no válida" in m for m in motivos)
+
+
+def test_fecha_de_fila_rechazada_no_bloquea_la_siguiente():
+    bloque = _bloque([{'Fecha': "2025-01-02", 'Firma': ""}, {'Fecha': "2025-01-02"}, {'Fecha': "2025-01-02"}])
+    motivos, _ = validar_bloque(bloque, set())
+    assert motivos[0] == "Falta: 12. Firmas de responsabilidad"
+    assert motivos[1] == ""
+    assert motivos[2] == "La fecha ya existe"
+
+
+def test_fecha_ya_guardada():
+    motivos, _ = validar_bloque(_bloque([{'Fecha': "2025-01-02"}]), {date(2025, 1, 2)})
+    assert motivos[0] == "La fecha ya existe"
+
+
+def test_importar_csv_iso(tmp_path):
+    almacen = AlmacenRDO(str(tmp_path / "rdo.sqlite"))
+    csv = _bloque([{'Fecha': "2025-01-02"}, {'Fecha': "2025-01-13"}]).to_csv(index=False)
+    resultado = importar(almacen, "C", 1000.0, io.StringIO(csv), "historico.csv")
+    df = almacen.leer("C")
+    almacen.cerrar()
+    assert resultado.insertados == 2
+    assert list(df['Fecha'].dt.date) == [date(2025, 1, 2), date(2025, 1, 13)]
+    assert list(df['Financiero Acum ($)']) == [100.0, 200.0]
+
+
+def test_fecha_fuera_de_orden():
+    bloque = _bloque([{'Fecha': "2025-01-05"}, {'Fecha': "2025-01-03"}, {'Fecha': "2025-01-06"}])
+    motivos, _ = validar_bloque(bloque, set(), date(2025, 1, 1))
+    assert list(motivos) == ["", "Fecha anterior al último RDO", ""]
+
+
+def test_importar_en_contrato_con_datos(tmp_path):
+    almacen = AlmacenRDO(str(tmp_path / "rdo.sqlite"))
+    guardar_rdo(almacen, "C", date(2025, 1, 10), "Día 10", 5.0, 500.0, "Actividad", 1, 1000.0)
+    filas = [{'Fecha': f"2025-01-0{d}"} for d in (1, 2, 3)] + [{'Fecha': "2025-01-10"}, {'Fecha': "2025-01-11"}, {'Fecha': "2025-01-12"}]
+    csv = _bloque(filas).to_csv(index=False)
+    # Bloques de dos filas: el orden también se controla entre bloques
+    resultado = importar(almacen, "C", 1000.0, io.StringIO(csv), "historico.csv", tam_bloque=2)
+    df = almacen.leer("C")
+    almacen.cerrar()
+
+    assert resultado.insertados == 2
+    rechazados = resultado.tabla_rechazados()
+    assert list(rechazados['Fila']) == [2, 3, 4, 5]
+    assert list(rechazados['Motivo']) == ["Fecha anterior al último RDO"] * 3 + ["La fecha ya existe"]
+    assert list(df['Fecha'].dt.date) == [date(2025, 1, 10), date(2025, 1, 11), date(2025, 1, 12)]
+    assert list(df['Financiero Acum ($)']) == [500.0, 600.0, 700.0]
+    assert list(df['Saldo ($)']) == [500.0, 400.0, 300.0]
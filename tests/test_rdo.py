@@ -0,0 +1,105 @@
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from almacen import AlmacenRDO, ConflictoVersion, FechaRepetida
+from rdo import corregir_rdo, guardar_rdo, recalcular_acumulados
+
+MONTO = 1_000_000.0
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    almacen = AlmacenRDO(str(tmp_path / "rdo.db"))
+    yield almacen
+    almacen.cerrar()
+
+
+def test_guardados_concurrentes_encadenan_acumulados(almacen):
+    hilos, por_hilo = 4, 25
+    errores = []
+
+    def fiscalizador(k):
+        try:
+            for i in range(por_hilo):
+                fecha = date(2025, 1, 1) + timedelta(days=k * por_hilo + i)
+                guardar_rdo(almacen, "C-1", fecha, f"Día {i}", 0.25, 100.0, "Actividad", 1, MONTO)
+        except Exception as e:  # noqa: BLE001 - se reporta en el hilo principal
+            errores.append(e)
+
+    trabajadores = [threading.Thread(target=fiscalizador, args=(k,)) for k in range(hilos)]
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+
+    assert errores == []
+    df = almacen.leer("C-1")
+    assert len(df) == hilos * por_hilo
+    # Cada fila continúa la anterior en orden de inserción, sin acumulados perdidos
+    assert df['Físico Acum (%)'].iloc[-1] == pytest.approx(0.25 * hilos * por_hilo)
+    assert df['Financiero Acum ($)'].tolist() == pytest.approx([100.0 * (n + 1) for n in range(len(df))])
+    assert df['Saldo ($)'].iloc[-1] == pytest.approx(MONTO - 100.0 * len(df))
+
+
+def test_fecha_repetida(almacen):
+    guardar_rdo(almacen, "C-1", date(2025, 1, 2), "Día 1", 1.0, 10.0, "Actividad", 1, MONTO)
+    with pytest.raises(FechaRepetida, match="02/01/2025"):
+        guardar_rdo(almacen, "C-1", date(2025, 1, 2), "Día 2", 1.0, 10.0, "Actividad", 1, MONTO)
+    assert almacen.contar("C-1") == 1
+
+
+def test_recalcular_acumulados_desde_una_fila():
+    df = pd.DataFrame({
+        'Físico Diario (%)': pd.array([10.0, 20.0, 30.0, 50.0], dtype='float32'),
+        'Inversión Diaria ($)': [100.0, 200.0, 300.0, 500.0],
+        'Físico Acum (%)': pd.array([10.0, 99.0, 99.0, 99.0], dtype='float32'),
+        'Financiero Acum ($)': [100.0, 0.0, 0.0, 0.0],
+        'Saldo ($)': [900.0, 0.0, 0.0, 0.0],
+    })
+    resultado = recalcular_acumulados(df, 1, 1000.0)
+    assert resultado['Físico Acum (%)'].tolist() == [10.0, 30.0, 60.0, 100.0]
+    assert resultado['Financiero Acum ($)'].tolist() == [100.0, 300.0, 600.0, 1000.0]
+    assert resultado['Saldo ($)'].tolist() == [900.0, 700.0, 400.0, 0.0]
+    assert (resultado.dtypes == df.dtypes).all()
+    assert df['Físico Acum (%)'].iloc[1] == 99.0  # no modifica la entrada
+
+
+def test_correccion_con_version_vieja(almacen):
+    for i in range(3):
+        guardar_rdo(almacen, "C-1", date(2025, 1, 1 + i), f"Día {i + 1}", 1.0, 10.0, "Actividad", 1, MONTO)
+    version = almacen.version("C-1")
+    id_rdo = almacen.leer("C-1").index[0]
+
+    guardar_rdo(almacen, "C-1", date(2025, 1, 4), "Día 4", 1.0, 10.0, "Actividad", 1, MONTO)
+    with pytest.raises(ConflictoVersion):
+        corregir_rdo(almacen, "C-1", id_rdo, {'Inversión Diaria ($)': 50.0}, MONTO, version_esperada=version)
+
+    corregir_rdo(almacen, "C-1", id_rdo, {'Inversión Diaria ($)': 50.0}, MONTO, version_esperada=almacen.version("C-1"))
+    assert almacen.leer("C-1")['Financiero Acum ($)'].tolist() == pytest.approx([50.0, 60.0, 70.0, 80.0])
+
+
+def test_correccion_a_fecha_de_otro_rdo(almacen):
+    for i in range(2):
+        guardar_rdo(almacen, "C-1", date(2025, 1, 1 + i), f"Día {i + 1}", 1.0, 10.0, "Actividad", 1, MONTO)
+    primero, segundo = almacen.leer("C-1").index
+    with pytest.raises(FechaRepetida):
+        corregir_rdo(almacen, "C-1", segundo, {'Fecha': date(2025, 1, 1)}, MONTO)
+    # Conservar la propia fecha no es un duplicado
+    corregir_rdo(almacen, "C-1", primero, {'Fecha': date(2025, 1, 1), 'Día N': "Día 1 (corregido)"}, MONTO)
+    assert almacen.existe_fecha("C-1", date(2025, 1, 1))
+    assert not almacen.existe_fecha("C-1", date(2025, 1, 1), excepto=primero)
+    assert almacen.opciones_edicion("C-1")[primero].endswith("Día 1 (corregido)")
+
+
+def test_borrar_solo_un_contrato(almacen):
+    for contrato in ("C-1", "C-2"):
+        guardar_rdo(almacen, contrato, date(2025, 1, 1), "Día 1", 1.0, 10.0, "Actividad", 1, MONTO)
+    version = almacen.version("C-1")
+    almacen.borrar("C-1")
+    assert almacen.contar("C-1") == 0
+    assert almacen.contar("C-2") == 1
+    assert almacen.version("C-1") > version
+    assert not almacen.existe_fecha("C-1", date(2025, 1, 1))